@@ -1,40 +1,59 @@
 """Import budget data via API endpoint."""
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import csv
-import json
+import orjson
+from itertools import islice
+
+API_URL = "http://localhost:8000"
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Number of budgets sent per bulk request
+BATCH_SIZE = 500
+
+def create_session():
+    """Create a requests session that reuses keep-alive connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=50,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _post_batch(session, api_url, batch):
+    """POST a batch of budgets; returns None if the server has no bulk endpoint."""
+    with session.post(f"{api_url}/bulk", data=orjson.dumps({"items": batch}),
+                      headers=JSON_HEADERS, timeout=60, stream=False) as response:
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            return [response.status_code] * len(batch)
+        return [
+            200 if result['success'] else 409 if result.get('duplicate') else result.get('error')
+            for result in orjson.loads(response.content)['results']
+        ]
+
+def _post_single(session, api_url, budget_data):
+    """POST a single budget and return the response status code."""
+    with session.post(api_url, data=orjson.dumps(budget_data), headers=JSON_HEADERS,
+                      timeout=10, stream=False) as response:
+        return response.status_code
 
 def import_budgets_via_api():
     """Import budgets via FastAPI endpoint with duplicate detection."""
     print("💰 Starting budget import via API...")
     
-    # Check existing budgets first
-    try:
-        existing_response = requests.get("http://localhost:8000/budgets?limit=1000", timeout=10)
-        if existing_response.status_code == 200:
-            existing_data = existing_response.json()
-            existing_budgets = existing_data.get('budgets', [])
-            
-            # Create set of existing budget keys for duplicate checking
-            existing_keys = set()
-            for budget in existing_budgets:
-                key = (
-                    budget['department'],
-                    budget['category'],
-                    budget['period_start'],
-                    budget['period_end'],
-                    float(budget['allocated_amount'])
-                )
-                existing_keys.add(key)
-            
-            print(f"📋 Found {len(existing_budgets)} existing budgets in database")
-        else:
-            existing_keys = set()
-            print("⚠️ Could not fetch existing budgets, proceeding anyway")
-    except Exception as e:
-        print(f"⚠️ Error checking existing budgets: {e}")
-        existing_keys = set()
-    
+    with create_session() as session:
+        _import_budgets(session)
+
+def _import_budgets(session):
+    """Run the budget import over a pooled HTTP session."""
     # Load CSV data
     try:
         budgets = []
@@ -47,52 +66,56 @@ def import_budgets_via_api():
         print(f"❌ Error loading CSV: {e}")
         return
     
-    # Import via API with duplicate checking
-    api_url = "http://localhost:8000/budgets"
+    # Import via API; the server rejects duplicates with 409 Conflict
+    api_url = f"{API_URL}/budgets"
     imported_count = 0
     skipped_count = 0
     errors = 0
     
+    pending = []
     for budget in budgets:
         try:
-            budget_data = {
+            pending.append({
                 "department": budget['department'],
                 "category": budget['category'],
                 "period_start": budget['period_start'],
                 "period_end": budget['period_end'],
                 "allocated_amount": float(budget['allocated_amount'])
-            }
-            
-            # Check if this budget already exists
-            budget_key = (
-                budget['department'],
-                budget['category'],
-                budget['period_start'],
-                budget['period_end'],
-                float(budget['allocated_amount'])
-            )
-            
-            if budget_key in existing_keys:
-                skipped_count += 1
-                continue  # Skip this duplicate
-            
-            response = requests.post(api_url, json=budget_data, timeout=10)
-            
-            if response.status_code == 200:
+            })
+        except Exception as e:
+            errors += 1
+            if errors <= 5:
+                print(f"⚠️  Error importing {budget.get('department', 'Unknown')}: {e}")
+    
+    # Send budgets in batches, falling back to single POSTs on older servers
+    bulk_supported = True
+    remaining = iter(pending)
+    while True:
+        batch = list(islice(remaining, BATCH_SIZE))
+        if not batch:
+            break
+        
+        try:
+            statuses = None
+            if bulk_supported:
+                statuses = _post_batch(session, api_url, batch)
+                bulk_supported = statuses is not None
+            if statuses is None:
+                statuses = [_post_single(session, api_url, budget_data) for budget_data in batch]
+        except Exception as e:
+            statuses = [e] * len(batch)
+        
+        for budget_data, status in zip(batch, statuses):
+            if status == 200:
                 imported_count += 1
-                existing_keys.add(budget_key)  # Add to existing set to prevent duplicates within this import
                 if imported_count % 50 == 0:
                     print(f"   Imported {imported_count} budgets...")
+            elif status == 409:
+                skipped_count += 1  # Already stored
             else:
                 errors += 1
                 if errors <= 5:  # Show first 5 errors
-                    print(f"⚠️  API Error for {budget['department']}-{budget['category']}: {response.status_code}")
-                
-        except Exception as e:
-            errors += 1
-            if errors <= 5:
-                print(f"⚠️  Error importing {budget.get('department', 'Unknown')}: {e}")
-            continue
+                    print(f"⚠️  API Error for {budget_data['department']}-{budget_data['category']}: {status}")
     
     print(f"✅ Successfully imported {imported_count} new budgets via API!")
     if skipped_count > 0:
@@ -102,9 +125,9 @@ def import_budgets_via_api():
     
     # Verify via API
     try:
-        stats_response = requests.get("http://localhost:8000/dashboard/stats", timeout=10)
+        stats_response = session.get(f"{API_URL}/dashboard/stats", timeout=10)
         if stats_response.status_code == 200:
-            stats = stats_response.json()
+            stats = orjson.loads(stats_response.content)
             print(f"📈 Verification: {stats['total_budgets']} budgets, ${stats['total_allocated']:,.2f} allocated")
             print(f"📊 Budget Utilization: {(stats['total_spent']/stats['total_allocated']*100):.1f}%" if stats['total_allocated'] > 0 else "📊 Budget Utilization: 0.0%")
         else:
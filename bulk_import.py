@@ -1,56 +1,127 @@
 """Bulk import data via API endpoint."""
 
+import asyncio
+import httpx
+from itertools import islice
 import pandas as pd
 import requests
-import json
+import orjson
 
-def bulk_import_via_api():
+try:
+    import h2  # noqa: F401 -- lets httpx negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Maximum number of in-flight POST requests
+MAX_CONCURRENCY = 32
+
+# Number of expenses sent per bulk request
+BATCH_SIZE = 500
+
+# Number of CSV rows held in memory at once
+CHUNK_SIZE = 50_000
+
+async def _post(client, sem, url, data):
+    """POST a single expense record, bounded by the shared semaphore."""
+    async with sem:
+        response = await client.post(url, content=orjson.dumps(data), headers=JSON_HEADERS)
+        return response.status_code
+
+async def _post_batch(client, sem, url, batch):
+    """POST a batch of expenses; returns None if the server has no bulk endpoint."""
+    async with sem:
+        response = await client.post(f"{url}/bulk", content=orjson.dumps({"items": batch}),
+                                     headers=JSON_HEADERS, timeout=60)
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        return [response.status_code] * len(batch)
+    body = orjson.loads(response.content)
+    return [200 if result['success'] else result.get('error') for result in body['results']]
+
+async def _import_batch(client, sem, url, batch):
+    """Import one batch, falling back to single POSTs on older servers."""
+    statuses = await _post_batch(client, sem, url, batch)
+    if statuses is None:
+        statuses = await asyncio.gather(
+            *[_post(client, sem, url, record) for record in batch],
+            return_exceptions=True
+        )
+    return statuses
+
+async def _import_records(client, sem, url, records):
+    """Import a list of expense records and return the number imported."""
+    remaining = iter(records)
+    batches = list(iter(lambda: list(islice(remaining, BATCH_SIZE)), []))
+
+    batch_results = await asyncio.gather(
+        *[_import_batch(client, sem, url, batch) for batch in batches],
+        return_exceptions=True
+    )
+
+    results = []
+    for batch, statuses in zip(batches, batch_results):
+        if isinstance(statuses, Exception):
+            statuses = [statuses] * len(batch)
+        results.extend(statuses)
+
+    imported_count = 0
+    for record, result in zip(records, results):
+        if isinstance(result, Exception):
+            print(f"⚠️  Error importing {record.get('vendor', 'Unknown')}: {result}")
+        elif result == 200:
+            imported_count += 1
+        else:
+            print(f"⚠️  API Error for {record['vendor']}: {result}")
+    return imported_count
+
+async def bulk_import_via_api():
     """Import expenses via FastAPI endpoint."""
     print("🚀 Starting bulk import via API...")
-    
-    # Load CSV data
+
+    # Open CSV data as a stream of chunks
     try:
-        df = pd.read_csv('data/expenses.csv')
-        print(f"📊 Loaded {len(df)} expense records from CSV")
+        reader = pd.read_csv('data/expenses.csv', chunksize=CHUNK_SIZE, dtype={'amount': 'float64'})
     except Exception as e:
         print(f"❌ Error loading CSV: {e}")
         return
-    
+
     # Import via API
     api_url = "http://localhost:8000/expenses"
     imported_count = 0
-    
-    for _, row in df.iterrows():
+    loaded_count = 0
+
+    # Fire concurrent batch POSTs over a single pooled client
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=MAX_CONCURRENCY)
+    async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=10.0) as client:
         try:
-            expense_data = {
-                "date": row['date'],
-                "amount": float(row['amount']),
-                "vendor": row['vendor'],
-                "description": row.get('description', ''),
-                "department": row['department'],
-                "category": row.get('category', 'Other')
-            }
-            
-            response = requests.post(api_url, json=expense_data, timeout=10)
-            
-            if response.status_code == 200:
-                imported_count += 1
-                if imported_count % 100 == 0:
-                    print(f"   Imported {imported_count} expenses...")
-            else:
-                print(f"⚠️  API Error for {row['vendor']}: {response.status_code}")
-                
+            for chunk in reader:
+                # Convert once to plain dicts; description/category are optional in the CSV
+                records = (
+                    chunk.reindex(columns=['date', 'amount', 'vendor', 'description', 'department', 'category'])
+                    .fillna({'description': '', 'category': 'Other'})
+                    .to_dict('records')
+                )
+                loaded_count += len(records)
+                imported_count += await _import_records(client, sem, api_url, records)
+                print(f"   Imported {imported_count} of {loaded_count} expenses...")
         except Exception as e:
-            print(f"⚠️  Error importing {row.get('vendor', 'Unknown')}: {e}")
-            continue
-    
+            print(f"❌ Error loading CSV: {e}")
+        finally:
+            reader.close()
+
+    print(f"📊 Loaded {loaded_count} expense records from CSV")
     print(f"✅ Successfully imported {imported_count} expenses via API!")
-    
+
     # Verify via API
     try:
         stats_response = requests.get("http://localhost:8000/dashboard/stats", timeout=10)
         if stats_response.status_code == 200:
-            stats = stats_response.json()
+            stats = orjson.loads(stats_response.content)
             print(f"📈 Verification: {stats['total_expenses']} expenses, ${stats['total_spent']:,.2f} total")
         else:
             print("⚠️  Could not verify import")
@@ -58,4 +129,4 @@ def bulk_import_via_api():
         print(f"⚠️  Verification error: {e}")
 
 if __name__ == "__main__":
-    bulk_import_via_api() 
\ No newline at end of file
+    asyncio.run(bulk_import_via_api())
@@ -1,7 +1,47 @@
 """Clean up duplicate budget entries in the database."""
 
+import asyncio
+import httpx
 import requests
-import json
+import orjson
+
+try:
+    import h2  # noqa: F401 -- lets httpx negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+API_URL = "http://localhost:8000"
+
+# Maximum number of in-flight DELETE requests
+MAX_CONCURRENCY = 16
+
+def to_cents(amount):
+    """Convert a currency amount to integer cents for exact comparison."""
+    return int(round(float(amount) * 100))
+
+def budget_key(budget):
+    """Build a single pre-joined string key from a budget's business fields."""
+    return (
+        f"{budget['department']}|{budget['category']}|{budget['period_start']}|"
+        f"{budget['period_end']}|{budget.get('currency', 'USD')}|{to_cents(budget['allocated_amount'])}"
+    )
+
+async def delete_budgets(budget_ids):
+    """Delete budgets concurrently and return the HTTP status (or error) per id."""
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    
+    async def delete(client, budget_id):
+        async with sem:
+            response = await client.delete(f"{API_URL}/budgets/{budget_id}")
+            return response.status_code
+    
+    limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=MAX_CONCURRENCY)
+    async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=10.0) as client:
+        return await asyncio.gather(
+            *[delete(client, budget_id) for budget_id in budget_ids],
+            return_exceptions=True
+        )
 
 def cleanup_duplicate_budgets():
     """Remove duplicate budget entries via API."""
@@ -9,13 +49,13 @@ def cleanup_duplicate_budgets():
     
     try:
         # Get all budgets from API
-        response = requests.get("http://localhost:8000/budgets?limit=1000", timeout=10)
+        response = requests.get(f"{API_URL}/budgets?limit=1000", timeout=10)
         
         if response.status_code != 200:
             print(f"❌ Failed to fetch budgets: {response.status_code}")
             return
         
-        budgets_data = response.json()
+        budgets_data = orjson.loads(response.content)
         budgets = budgets_data.get('budgets', [])
         print(f"📊 Found {len(budgets)} total budget records")
         
@@ -25,13 +65,7 @@ def cleanup_duplicate_budgets():
         
         for budget in budgets:
             # Create unique key based on business fields
-            key = (
-                budget['department'],
-                budget['category'], 
-                budget['period_start'],
-                budget['period_end'],
-                float(budget['allocated_amount'])
-            )
+            key = budget_key(budget)
             
             if key in unique_budgets:
                 # This is a duplicate - mark for deletion (keep the first one)
@@ -45,11 +79,17 @@ def cleanup_duplicate_budgets():
         print(f"🗑️  Found {len(duplicates_to_delete)} duplicates to remove")
         
         if duplicates_to_delete:
-            print("⚠️  Note: Manual deletion via API endpoints not implemented")
-            print("🔧 Recommendation: Use database tool to delete duplicates by ID")
-            print("📋 Duplicate IDs to delete:")
-            for dup_id in duplicates_to_delete:
-                print(f"   - ID: {dup_id}")
+            statuses = asyncio.run(delete_budgets(duplicates_to_delete))
+            deleted_count = sum(1 for status in statuses if status == 200)
+            print(f"🗑️  Deleted {deleted_count} duplicate budgets")
+            
+            remaining = [dup_id for dup_id, status in zip(duplicates_to_delete, statuses) if status != 200]
+            if remaining:
+                print("⚠️  Some duplicates could not be deleted via the API")
+                print("🔧 Recommendation: Use database tool to delete duplicates by ID")
+                print("📋 Duplicate IDs to delete:")
+                for dup_id in remaining:
+                    print(f"   - ID: {dup_id}")
         else:
             print("✅ No duplicates found!")
         
@@ -5,15 +5,43 @@ Professional dark blue theme.
 """
 
 import streamlit as st
+import importlib.util
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
+# Plotly is imported by the chart pages themselves; checked here without importing it
+PLOTLY_RESAMPLER_AVAILABLE = importlib.util.find_spec("plotly_resampler") is not None
+try:
+    import pyarrow.csv as pacsv
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    from requests_toolbelt import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    TOOLBELT_AVAILABLE = False
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import time
+from pathlib import Path
+from io import BytesIO
+from collections import Counter
+from itertools import islice
+from types import MappingProxyType
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 # Configure Streamlit page
 st.set_page_config(
@@ -25,257 +53,303 @@ st.set_page_config(
 
 # Configuration
 API_BASE_URL = "http://127.0.0.1:8000"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+HEALTH_TTL_SECONDS = 10
+STREAMING_UPLOAD_BYTES = 50 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+ARROW_EXPORT_FORMATS = ("csv", "json")
+MAX_ERRORS_SHOWN = 100
+EXPENSE_CSV_COLUMNS = ('date', 'amount', 'currency', 'vendor', 'description', 'department', 'category')
+BUDGET_CSV_COLUMNS = ('department', 'category', 'period_start', 'period_end', 'allocated_amount', 'currency')
+# Form and filter options shared by the data management and download pages
+DEPARTMENTS = ("Engineering", "Marketing", "Sales", "HR", "Finance", "Operations", "Executive")
+CATEGORIES = (
+    "IT Infrastructure", "Marketing", "Travel", "Office Supplies",
+    "Personnel", "Utilities", "Professional Services", "Training",
+    "Equipment", "Other"
+)
+CURRENCY_OPTIONS = MappingProxyType({
+    "USD": "US Dollar (USD)",
+    "INR": "Indian Rupee (INR)",
+    "CAD": "Canadian Dollar (CAD)",
+    "TRY": "Turkish Lira (TRY)"
+})
+FILTER_CURRENCY_OPTIONS = MappingProxyType({"ALL": "All Currencies", **CURRENCY_OPTIONS})
+# Precomputed widget arguments: the same option tuple and formatter object on every rerun
+CURRENCY_KEYS = tuple(CURRENCY_OPTIONS)
+FILTER_CURRENCY_KEYS = tuple(FILTER_CURRENCY_OPTIONS)
+_CCY_FMT = CURRENCY_OPTIONS.__getitem__
+_FILTER_CCY_FMT = FILTER_CURRENCY_OPTIONS.__getitem__
+DEPARTMENT_FILTERS = ("All Departments",) + DEPARTMENTS
+CATEGORY_FILTERS = ("All Categories",) + CATEGORIES
+
+# Explicit column types for the download previews, so the frontend skips per-cell inference
+PREVIEW_COLS_EXPENSE = {
+    "amount": st.column_config.NumberColumn("Amount", format="%.2f"),
+    "date": st.column_config.DateColumn("Date"),
+    "currency": st.column_config.TextColumn("Ccy", width="small")
+}
+PREVIEW_COLS_BUDGET = {
+    "allocated_amount": st.column_config.NumberColumn("Allocated", format="%.2f"),
+    "spent_amount": st.column_config.NumberColumn("Spent", format="%.2f"),
+    "period_start": st.column_config.DateColumn("Period Start"),
+    "period_end": st.column_config.DateColumn("Period End"),
+    "currency": st.column_config.TextColumn("Ccy", width="small")
+}
+
+# Preset download date ranges: today -> (start_date, end_date)
+DATE_RANGES = {
+    "Last 30 Days": lambda today: (today - timedelta(days=30), today),
+    "Last 3 Months": lambda today: (today - timedelta(days=90), today),
+    "This Year": lambda today: (today.replace(month=1, day=1), today)
+}
 
 # Professional Dark Blue CSS Styling
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Hide Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    .stDeployButton {display: none;}
-    
-    /* Root styling */
-    .stApp {
-        background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-        font-family: 'Inter', sans-serif;
-        color: #e2e8f0;
-    }
-    
-    /* Main container */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-        max-width: 95%;
-    }
-    
-    /* Main header */
-    .main-header {
-        background: linear-gradient(135deg, #1e40af 0%, #3b82f6 50%, #60a5fa 100%);
-        color: white;
-        padding: 2.5rem 2rem;
-        border-radius: 16px;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 20px 40px rgba(30, 64, 175, 0.3);
-        border: 1px solid rgba(59, 130, 246, 0.2);
-        backdrop-filter: blur(10px);
-    }
-    
-    .main-header h1 {
-        font-size: 2.8rem;
-        font-weight: 700;
-        margin: 0 0 0.5rem 0;
-        text-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        letter-spacing: -0.02em;
-    }
-    
-    .main-header p {
-        font-size: 1.2rem;
-        margin: 0;
-        opacity: 0.9;
-        font-weight: 400;
-    }
-    
-    /* Section containers */
-    .section-container {
-        background: linear-gradient(145deg, #1e293b 0%, #334155 100%);
-        padding: 2rem;
-        border-radius: 16px;
-        margin: 1.5rem 0;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
-        border: 1px solid rgba(59, 130, 246, 0.1);
-        backdrop-filter: blur(10px);
-    }
-    
-    .section-header {
-        color: #e2e8f0;
-        font-size: 1.5rem;
-        font-weight: 600;
-        margin-bottom: 1.5rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid rgba(59, 130, 246, 0.3);
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-    
-    /* Metric cards */
-    .metric-card {
-        background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        color: white;
-        text-align: center;
-        margin: 0.5rem 0;
-        box-shadow: 0 8px 24px rgba(30, 64, 175, 0.3);
-        border: 1px solid rgba(59, 130, 246, 0.2);
-        transition: all 0.3s ease;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 12px 32px rgba(30, 64, 175, 0.4);
-    }
-    
-    /* Alert boxes */
-    .alert-box {
-        padding: 1.2rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        font-weight: 500;
-        border: 1px solid;
-        backdrop-filter: blur(10px);
-    }
-    
-    .alert-high {
-        background: rgba(239, 68, 68, 0.1);
-        border-color: #ef4444;
-        color: #fca5a5;
-    }
-    
-    .alert-medium {
-        background: rgba(245, 158, 11, 0.1);
-        border-color: #f59e0b;
-        color: #fbbf24;
-    }
-    
-    .alert-low {
-        background: rgba(139, 92, 246, 0.1);
-        border-color: #8b5cf6;
-        color: #c4b5fd;
-    }
-    
-    .success-box {
-        background: rgba(16, 185, 129, 0.1);
-        border-color: #10b981;
-        color: #6ee7b7;
-        padding: 1.2rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        font-weight: 500;
-        border: 1px solid;
-        backdrop-filter: blur(10px);
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%);
-        color: white !important;
-        border: none;
-        border-radius: 10px;
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 12px rgba(59, 130, 246, 0.3);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 8px 24px rgba(59, 130, 246, 0.4);
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #0f172a 0%, #1e293b 100%);
-    }
-    
-    /* Professional icons */
-    .icon {
-        display: inline-block;
-        width: 18px;
-        height: 18px;
-        margin-right: 8px;
-        text-align: center;
-        font-weight: bold;
-        background: #3b82f6;
-        color: white;
-        border-radius: 4px;
-        font-size: 10px;
-        line-height: 18px;
-    }
-    
-    /* Consistent typography */
-    .stMarkdown h1, .stMarkdown h2, .stMarkdown h3 {
-        color: #e2e8f0;
-        font-weight: 600;
-    }
-    
-    .stMarkdown p {
-        color: #94a3b8;
-        line-height: 1.6;
-    }
-    
-    /* Data tables */
-    .stDataFrame {
-        background: rgba(30, 41, 59, 0.8);
-        border: 1px solid rgba(59, 130, 246, 0.2);
-        border-radius: 12px;
-        overflow: hidden;
-    }
-    
-    /* Charts */
-    .js-plotly-plot {
-        background: transparent !important;
-        border-radius: 12px;
-        box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
-    }
-    
-    /* Input styling */
-    .stSelectbox > div > div {
-        background: rgba(30, 41, 59, 0.8);
-        border: 1px solid rgba(59, 130, 246, 0.2);
-        border-radius: 8px;
-        color: #e2e8f0;
-    }
-    
-    .stTextInput > div > div > input {
-        background: rgba(30, 41, 59, 0.8);
-        border: 1px solid rgba(59, 130, 246, 0.2);
-        border-radius: 8px;
-        color: #e2e8f0;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def load_css() -> str:
+    """Read the dashboard theme once per server process."""
+    return (Path(__file__).parent / "static" / "theme.css").read_text(encoding="utf-8")
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # API Helper Functions
-@st.cache_data(ttl=60)  # Cache for 1 minute
-def call_api(endpoint: str, method: str = "GET", data: Dict = None) -> Optional[Dict]:
-    """Make API calls with error handling and caching."""
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Create one pooled keep-alive session shared across reruns."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+    return session
+
+def parse_json(content: bytes):
+    """Parse a JSON payload, with orjson when installed."""
+    return orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+
+@st.cache_data(ttl=60, show_spinner=False)  # Cache for 1 minute
+def _fetch(endpoint: str, method: str = "GET", data: Dict = None, accept: Optional[str] = None) -> Tuple[Optional[Dict], Optional[str]]:
+    """Make a cached API call and return (payload, error); safe to run off the script thread."""
     try:
         url = f"{API_BASE_URL}{endpoint}"
         
+        session = get_session()
         if method == "GET":
-            response = requests.get(url, timeout=10)
+            response = session.get(url, headers={"Accept": accept} if accept else None, timeout=10)
         elif method == "POST":
-            response = requests.post(url, json=data, timeout=10)
+            response = session.post(url, json=data, timeout=10)
         else:
-            st.error(f"Unsupported HTTP method: {method}")
-            return None
+            return None, f"Unsupported HTTP method: {method}"
         
         if response.status_code == 200:
-            return response.json()
+            if response.headers.get("Content-Type", "").startswith(ARROW_MEDIA_TYPE):
+                return feather.read_feather(BytesIO(response.content)), None
+            return parse_json(response.content), None
         else:
-            st.error(f"API Error {response.status_code}: {response.text}")
-            return None
+            return None, f"API Error {response.status_code}: {response.text}"
             
     except requests.exceptions.ConnectionError:
+        return None, "connection"
+    except requests.exceptions.Timeout:
+        return None, "timeout"
+    except Exception as e:
+        return None, f"❌ API Error: {str(e)}"
+
+def _show_api_error(error: str):
+    """Render an error returned by _fetch."""
+    if error == "connection":
         st.error("🔌 Cannot connect to API backend. Please start the API server first.")
         st.info("Run: `py -m uvicorn src.api.main:app --reload --port 8000`")
-        return None
-    except requests.exceptions.Timeout:
+    elif error == "timeout":
         st.error("⏰ API request timed out")
+    else:
+        st.error(error)
+
+def call_api(endpoint: str, method: str = "GET", data: Dict = None) -> Optional[Dict]:
+    """Make API calls with error handling and caching."""
+    payload, error = _fetch(endpoint, method, data)
+    if error:
+        _show_api_error(error)
+    return payload
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_frame(endpoint: str, columns: Tuple[str, ...], date_columns: Tuple[str, ...] = ()) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Fetch a {'data': [...]} endpoint (as Arrow IPC when possible) and build its DataFrame once per cache period."""
+    payload, error = _fetch(endpoint, accept=f"{ARROW_MEDIA_TYPE}, application/json" if PYARROW_AVAILABLE else None)
+    if isinstance(payload, pd.DataFrame):
+        df = payload if not payload.empty else pd.DataFrame(columns=list(columns))
+    elif not payload or 'data' not in payload:
+        return None, error
+    # Convert list of dicts to DataFrame for visualization
+    elif payload['data']:
+        df = pd.DataFrame(payload['data'])
+    else:
+        df = pd.DataFrame(columns=list(columns))
+    for column in date_columns:
+        df[column] = pd.to_datetime(df[column])
+    
+    # Amounts keep their cents for hover values; only the counts are downcast
+    if 'transaction_count' in df.columns:
+        df['transaction_count'] = pd.to_numeric(df['transaction_count'], downcast='integer')
+    return df, None
+
+def _gather(fetch, specs: List[Tuple]) -> List:
+    """Run cached fetches concurrently and report each distinct error once."""
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=6,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        results = list(executor.map(lambda spec: fetch(*spec), specs))
+    
+    # Errors are rendered from the script thread
+    for error in dict.fromkeys(error for _, error in results if error):
+        _show_api_error(error)
+    return [payload for payload, _ in results]
+
+def call_api_many(specs: List[Tuple]) -> List[Optional[Dict]]:
+    """Make several API calls concurrently; specs are (endpoint[, method[, data]]) tuples."""
+    return _gather(_fetch, specs)
+
+def call_frames_many(specs: List[Tuple]) -> List[Optional[pd.DataFrame]]:
+    """Fetch several {'data': [...]} endpoints concurrently as DataFrames; specs are _fetch_frame arguments."""
+    return _gather(_fetch_frame, specs)
+
+@st.cache_data(ttl=HEALTH_TTL_SECONDS, show_spinner=False)
+def check_api_health() -> bool:
+    """Check if API backend is running; the answer is shared by all sessions for HEALTH_TTL_SECONDS."""
+    try:
+        response = get_session().get(f"{API_BASE_URL}/health", timeout=5)
+        return response.status_code == 200 and parse_json(response.content).get("status") == "healthy"
+    except (requests.exceptions.RequestException, ValueError):
+        return False
+
+class PredictionError(Exception):
+    """A failed /ml/predict call; raised so the failure is not cached."""
+
+@st.cache_data(ttl=3600, max_entries=1024, show_spinner=False)
+def _predict(vendor: str, description: str) -> Dict:
+    """Cached category prediction for already-normalized inputs."""
+    prediction, error = _fetch("/ml/predict", "POST", {
+        "vendor": vendor,
+        "description": description
+    })
+    if error or prediction is None:
+        raise PredictionError(error)
+    return prediction
+
+def predict_category(vendor: str, description: str) -> Optional[Dict]:
+    """Predict an expense category; the classifier is case-insensitive, so repeat lookups share a cache entry."""
+    try:
+        return _predict(vendor.strip().lower(), (description or "").strip().lower())
+    except PredictionError as e:
+        if e.args[0]:
+            _show_api_error(e.args[0])
         return None
+
+def call_api_stream(endpoint: str):
+    """Yield records from an API endpoint as they arrive, using NDJSON when the server supports it."""
+    url = f"{API_BASE_URL}{endpoint}"
+    with get_session().get(url, headers={"Accept": "application/x-ndjson"}, stream=True, timeout=10) as response:
+        response.raise_for_status()
+        if not response.headers.get("Content-Type", "").startswith("application/x-ndjson"):
+            yield from parse_json(response.content).get('data', [])
+            return
+        for line in response.iter_lines():
+            if line:
+                yield parse_json(line)
+
+def stream_expenses(endpoint: str, slot, paint_every: int = 5) -> pd.DataFrame:
+    """Stream expenses into a placeholder, repainting as rows arrive."""
+    rows = []
+    try:
+        for row in call_api_stream(endpoint):
+            rows.append(row)
+            if len(rows) % paint_every == 0:
+                slot.dataframe(format_expenses(pd.DataFrame(rows)), use_container_width=True, hide_index=True)
+    except requests.exceptions.ConnectionError:
+        _show_api_error("connection")
+    except requests.exceptions.Timeout:
+        _show_api_error("timeout")
     except Exception as e:
-        st.error(f"❌ API Error: {str(e)}")
-        return None
+        _show_api_error(f"❌ API Error: {str(e)}")
+    return pd.DataFrame(rows)
 
-def check_api_health() -> bool:
-    """Check if API backend is running."""
-    health = call_api("/health")
-    return health is not None and health.get("status") == "healthy"
+def format_expenses(expenses: pd.DataFrame) -> pd.DataFrame:
+    """Format an expense frame for display."""
+    display_df = expenses.copy()
+    
+    # Ensure currency column exists and format amount with currency
+    if 'currency' in display_df.columns and 'amount' in display_df.columns:
+        display_df['Amount'] = display_df['amount'].map("{:,.2f}".format).str.cat(
+            display_df['currency'].astype(str), sep=' '
+        )
+        # Remove the original amount and currency columns for cleaner display
+        display_df.drop(columns=['amount', 'currency', 'id', 'created_at'], errors='ignore', inplace=True)
+    
+    return display_df
+
+def show_import_errors(errors: List[str], limit: int = MAX_ERRORS_SHOWN):
+    """List import errors in an expander, rendering at most `limit` of them as one markdown block."""
+    with st.expander(f"View Errors ({len(errors)})"):
+        st.markdown("\n".join(f"- {error}" for error in errors[:limit]))
+        if len(errors) > limit:
+            st.caption(f"... and {len(errors) - limit} more")
+
+def validate_csv(uploaded_file, required: Tuple[str, ...], preview_rows: int = 20) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Parse the header and first rows of an uploaded CSV and return (preview, error), so bad files are caught before upload."""
+    try:
+        if PYARROW_AVAILABLE:
+            # Only the first block is parsed; the server validates the remaining rows
+            reader = pacsv.open_csv(BytesIO(uploaded_file.getvalue()))
+            columns = reader.schema.names
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                batch = reader.schema.empty_table()
+            preview = batch.slice(0, preview_rows).to_pandas()
+        else:
+            preview = pd.read_csv(BytesIO(uploaded_file.getvalue()), nrows=preview_rows)
+            columns = list(preview.columns)
+    except Exception as e:
+        return None, f"Could not parse CSV: {str(e)}"
+    
+    missing = [column for column in required if column not in columns]
+    if missing:
+        return None, f"Missing columns: {', '.join(missing)}"
+    return preview, None
+
+def upload_csv(endpoint: str, uploaded_file, default_currency: str) -> requests.Response:
+    """POST an uploaded CSV as multipart form data; files over STREAMING_UPLOAD_BYTES are streamed in chunks."""
+    uploaded_file.seek(0)
+    file_field = (uploaded_file.name, uploaded_file, uploaded_file.type or "text/csv")
+    url = f"{API_BASE_URL}{endpoint}"
+    
+    if TOOLBELT_AVAILABLE and uploaded_file.size > STREAMING_UPLOAD_BYTES:
+        encoder = MultipartEncoder(fields={"file": file_field, "default_currency": default_currency})
+        return get_session().post(url, data=encoder, headers={"Content-Type": encoder.content_type})
+    return get_session().post(url, files={"file": file_field}, data={"default_currency": default_currency})
+
+def expenses_endpoint(currency: str) -> str:
+    """Endpoint for the most recent expenses in one currency."""
+    return f"/expenses?currency={currency}&limit=20&sort=created_at_desc"
+
+@contextmanager
+def section(title: str, icon: Optional[str] = None):
+    """Group a page section under its styled header; the header HTML closes itself, so no closing element is emitted."""
+    icon_html = f'<span class="icon">{icon}</span>' if icon else ''
+    with st.container():
+        st.markdown(f'''
+        <div class="section-container">
+            <div class="section-header">
+                {icon_html}{title}
+            </div>
+        ''', unsafe_allow_html=True)
+        yield
 
 # Dashboard Pages
 def show_overview_page():
@@ -287,33 +361,30 @@ def show_overview_page():
     </div>
     ''', unsafe_allow_html=True)
     
-    # API Health Check
+    # API Health Check (cached, so this reuses the sidebar's answer)
     if not check_api_health():
-        st.markdown('''
-        <div class="alert-box alert-high">
-            <strong>STATUS:</strong> API Backend is not running! Please start the backend server: <code>py -m uvicorn src.api.main:app --reload --port 8000</code>
-        </div>
-        ''', unsafe_allow_html=True)
+        st.error("**STATUS:** API Backend is not running! Please start the backend server: `py -m uvicorn src.api.main:app --reload --port 8000`")
         return
     
-    st.markdown('''
-    <div class="success-box">
-        <strong>STATUS:</strong> Successfully connected to AI Budgeting Backend
-    </div>
-    ''', unsafe_allow_html=True)
+    st.success("**STATUS:** Successfully connected to AI Budgeting Backend")
+
+    # Fetch stats and the filtered expense log concurrently
+    prefetched_currency = st.session_state.get("expense_log_currency", "ALL")
+    specs = [("/dashboard/stats",)]
+    if prefetched_currency != "ALL":
+        specs.append((expenses_endpoint(prefetched_currency),))
+    stats, *prefetched_expenses = call_api_many(specs)
 
-    # Get dashboard stats
-    stats = call_api("/dashboard/stats")
-    
     if stats:
-        # Key Metrics Section
-        st.markdown('''
-        <div class="section-container">
-            <div class="section-header">
-                <span class="icon">KPI</span>Key Performance Indicators
-            </div>
-        ''', unsafe_allow_html=True)
-        
+        _kpi_strip(stats)
+        _recent_activity(stats, prefetched_currency, prefetched_expenses)
+    
+    _quick_actions()
+
+def _kpi_strip(stats: Dict):
+    """Render the key performance indicator metrics."""
+    # Key Metrics Section
+    with section("Key Performance Indicators", "KPI"):
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
@@ -345,33 +416,19 @@ def show_overview_page():
                 value=f"{budget_utilization:.1f}%",
                 delta="Actual vs Planned"
             )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Recent Activity Section
-        st.markdown('''
-        <div class="section-container">
-            <div class="section-header">
-                <span class="icon">LOG</span>Recent Expense Activity
-            </div>
-        ''', unsafe_allow_html=True)
-        
-        # Currency filter for expense logs
-        currency_filter_options = {
-            "ALL": "All Currencies",
-            "USD": "US Dollar (USD)",
-            "INR": "Indian Rupee (INR)", 
-            "CAD": "Canadian Dollar (CAD)",
-            "TRY": "Turkish Lira (TRY)"
-        }
-        
+
+@st.fragment
+def _recent_activity(stats: Dict, prefetched_currency: str, prefetched_expenses: List[Optional[Dict]]):
+    """Render the expense log; changing the currency filter reruns only this block."""
+    # Recent Activity Section
+    with section("Recent Expense Activity", "LOG"):
         col1, col2, col3 = st.columns([2, 2, 1])
         
         with col1:
             selected_currency = st.selectbox(
                 "Filter by Currency", 
-                options=list(currency_filter_options.keys()),
-                format_func=lambda x: currency_filter_options[x],
+                options=FILTER_CURRENCY_KEYS,
+                format_func=_FILTER_CCY_FMT,
                 key="expense_log_currency"
             )
         
@@ -383,6 +440,9 @@ def show_overview_page():
                 st.cache_data.clear()
                 st.rerun()
         
+        # Reserve the table slot so streamed rows paint in place
+        table_slot = st.empty()
+        
         # Get filtered expenses based on currency selection
         if selected_currency == "ALL":
             # Get all expenses with recent activity endpoint
@@ -394,350 +454,275 @@ def show_overview_page():
                 filtered_expenses = pd.DataFrame()
         else:
             # Get expenses filtered by specific currency
-            expense_endpoint = f"/expenses?currency={selected_currency}&limit=20&sort=created_at_desc"
-            expense_data = call_api(expense_endpoint)
-            
-            if expense_data and expense_data.get('data'):
-                filtered_expenses = pd.DataFrame(expense_data['data'])
+            if selected_currency == prefetched_currency:
+                expense_data = prefetched_expenses[0]
+                if expense_data and expense_data.get('data'):
+                    filtered_expenses = pd.DataFrame(expense_data['data'])
+                else:
+                    filtered_expenses = pd.DataFrame()
             else:
-                filtered_expenses = pd.DataFrame()
+                filtered_expenses = stream_expenses(expenses_endpoint(selected_currency), table_slot)
         
         # Display filtered expenses
         if not filtered_expenses.empty:
-            # Format the dataframe for better display
-            display_df = filtered_expenses.copy()
-            
-            # Ensure currency column exists and format amount with currency
-            if 'currency' in display_df.columns and 'amount' in display_df.columns:
-                display_df['Amount'] = display_df.apply(
-                    lambda row: f"{row['amount']:,.2f} {row['currency']}", axis=1
-                )
-                # Remove the original amount and currency columns for cleaner display
-                columns_to_show = [col for col in display_df.columns if col not in ['amount', 'currency', 'id', 'created_at']]
-                display_df = display_df[columns_to_show]
-            
             # Display the expenses table
-            st.dataframe(
-                display_df,
+            table_slot.dataframe(
+                format_expenses(filtered_expenses),
                 use_container_width=True,
                 hide_index=True
             )
             
-            # Show currency summary
-            if selected_currency == "ALL" and 'currency' in filtered_expenses.columns:
-                currency_summary = filtered_expenses.groupby('currency').agg({
-                    'amount': ['count', 'sum']
-                }).round(2)
-                currency_summary.columns = ['Count', 'Total Amount']
-                
+            # Show currency summary, totalled by the API over all expenses
+            if selected_currency == "ALL" and stats.get('currency_summary'):
                 st.subheader("Currency Summary")
-                st.dataframe(currency_summary, use_container_width=True)
+                st.dataframe(
+                    pd.DataFrame(stats['currency_summary']).set_index('currency').rename(
+                        columns={'count': 'Count', 'total': 'Total Amount'}
+                    ),
+                    use_container_width=True
+                )
         else:
             if selected_currency == "ALL":
                 st.info("No recent expenses found")
             else:
-                st.info(f"No expenses found for {currency_filter_options[selected_currency]}")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Quick Actions Section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">ACT</span>Quick Actions
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        if st.button("View Analytics", use_container_width=True):
-            st.session_state.page = "Analytics"
-            st.rerun()
-    
-    with col2:
-        if st.button("ML Predictions", use_container_width=True):
-            st.session_state.page = "Expense Classification"
-            st.rerun()
-    
-    with col3:
-        if st.button("Forecasting", use_container_width=True):
-            st.session_state.page = "Forecasting"
-            st.rerun()
-    
-    with col4:
-        if st.button("Anomaly Alerts", use_container_width=True):
-            st.session_state.page = "Anomaly Detection"
-            st.rerun()
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+                st.info(f"No expenses found for {FILTER_CURRENCY_OPTIONS[selected_currency]}")
 
-def show_analytics_page():
-    """Display analytics and visualizations."""
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">CHT</span>Spending Analytics & Insights
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    # Department Spending Section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">ORG</span>Spending by Department
-        </div>
-    ''', unsafe_allow_html=True)
-
-    dept_data = call_api("/dashboard/spending-by-department?months=12")
-    
-    if dept_data and 'data' in dept_data:
-        # Extract the actual data from the API response (list of dicts)
-        spending_data = dept_data['data']
-        # Convert list of dicts to DataFrame for visualization
-        if spending_data:
-            df_dept = pd.DataFrame(spending_data)
-        else:
-            df_dept = pd.DataFrame(columns=['department', 'total_amount'])
+@st.fragment
+def _quick_actions():
+    """Render the page navigation shortcuts."""
+    # Quick Actions Section
+    with section("Quick Actions", "ACT"):
+        col1, col2, col3, col4 = st.columns(4)
         
-        # Create pie chart
-        fig_pie = px.pie(
-            df_dept, 
-            values='total_amount', 
-            names='department',
-            title="Department Spending Distribution (Last 12 Months)",
-            color_discrete_sequence=['#3b82f6', '#60a5fa', '#93c5fd', '#1e40af', '#2563eb', '#1d4ed8', '#1e3a8a']
-        )
-        fig_pie.update_layout(
-            title_font_size=16,
-            font_family="Inter",
-            title_font_color="#e2e8f0",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font_color='#e2e8f0'
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        with col1:
+            if st.button("View Analytics", use_container_width=True):
+                st.session_state.page = "Analytics"
+                st.rerun()
         
-        # Create bar chart
-        fig_bar = px.bar(
-            df_dept, 
-            x='department', 
-            y='total_amount',
-            title="Department Spending Amounts",
-            color='total_amount',
-            color_continuous_scale='Blues'
-        )
-        fig_bar.update_layout(
-            xaxis_tickangle=-45,
-            title_font_size=16,
-            font_family="Inter",
-            title_font_color="#e2e8f0",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font_color='#e2e8f0',
-            xaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)'),
-            yaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)')
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        with col2:
+            if st.button("ML Predictions", use_container_width=True):
+                st.session_state.page = "Expense Classification"
+                st.rerun()
         
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Category Spending Section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">CAT</span>Spending by Category
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    cat_data = call_api("/dashboard/spending-by-category?months=12")
-    
-    if cat_data and 'data' in cat_data:
-        # Extract the actual data from the API response (list of dicts)
-        category_data = cat_data['data']
-        # Convert list of dicts to DataFrame for visualization
-        if category_data:
-            df_cat = pd.DataFrame(category_data)
-        else:
-            df_cat = pd.DataFrame(columns=['category', 'total_amount'])
+        with col3:
+            if st.button("Forecasting", use_container_width=True):
+                st.session_state.page = "Forecasting"
+                st.rerun()
         
-        # Create horizontal bar chart
-        fig_cat = px.bar(
-            df_cat.head(10), 
-            x='total_amount', 
-            y='category',
-            orientation='h',
-            title="Top 10 Categories by Spending",
-            color='total_amount',
-            color_continuous_scale='Blues'
-        )
-        fig_cat.update_layout(
-            title_font_size=16,
-            font_family="Inter",
-            title_font_color="#e2e8f0",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font_color='#e2e8f0',
-            xaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)'),
-            yaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)')
-        )
-        st.plotly_chart(fig_cat, use_container_width=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Monthly Trends Section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">TRD</span>Monthly Spending Trends
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    trends_data = call_api("/dashboard/monthly-trends?months=12")
-    
-    if trends_data and 'data' in trends_data:
-        # Extract the actual data from the API response (list of dicts)
-        monthly_data = trends_data['data']
-        # Convert list of dicts to DataFrame for visualization
-        if monthly_data:
-            df_trends = pd.DataFrame(monthly_data)
-        else:
-            df_trends = pd.DataFrame(columns=['month', 'total_amount'])
-        df_trends['month'] = pd.to_datetime(df_trends['month'])
+        with col4:
+            if st.button("Anomaly Alerts", use_container_width=True):
+                st.session_state.page = "Anomaly Detection"
+                st.rerun()
+
+def show_analytics_page():
+    """Display analytics and visualizations."""
+    import plotly.express as px
+    
+    with section("Spending Analytics & Insights", "CHT"):
+        # Department Spending Section
+        with section("Spending by Department", "ORG"):
+            df_dept, df_cat, df_trends = call_frames_many([
+                ("/dashboard/spending-by-department?months=12", ('department', 'total_amount')),
+                ("/dashboard/spending-by-category?months=12&top_n=10", ('category', 'total_amount')),
+                ("/dashboard/monthly-trends?months=12", ('month', 'total_amount'), ('month',))
+            ])
+            
+            if df_dept is not None:
+                # Create pie chart
+                fig_pie = px.pie(
+                    df_dept, 
+                    values='total_amount', 
+                    names='department',
+                    title="Department Spending Distribution (Last 12 Months)",
+                    color_discrete_sequence=['#3b82f6', '#60a5fa', '#93c5fd', '#1e40af', '#2563eb', '#1d4ed8', '#1e3a8a']
+                )
+                fig_pie.update_layout(
+                    title_font_size=16,
+                    font_family="Inter",
+                    title_font_color="#e2e8f0",
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='#e2e8f0'
+                )
+                st.plotly_chart(fig_pie, use_container_width=True)
+                
+                # Create bar chart
+                fig_bar = px.bar(
+                    df_dept, 
+                    x='department', 
+                    y='total_amount',
+                    title="Department Spending Amounts",
+                    color='total_amount',
+                    color_continuous_scale='Blues'
+                )
+                fig_bar.update_layout(
+                    xaxis_tickangle=-45,
+                    title_font_size=16,
+                    font_family="Inter",
+                    title_font_color="#e2e8f0",
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='#e2e8f0',
+                    xaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)'),
+                    yaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)')
+                )
+                st.plotly_chart(fig_bar, use_container_width=True)
         
-        # Create line chart
-        fig_trends = px.line(
-            df_trends, 
-            x='month', 
-            y='total_amount',
-            title="Monthly Spending Trends (Last 12 Months)",
-            markers=True
-        )
-        fig_trends.update_layout(
-            xaxis_title="Month",
-            yaxis_title="Total Amount ($)",
-            title_font_size=16,
-            font_family="Inter",
-            title_font_color="#e2e8f0",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font_color='#e2e8f0',
-            xaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)'),
-            yaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)')
-        )
-        fig_trends.update_traces(line_color='#3b82f6', marker_color='#60a5fa')
-        st.plotly_chart(fig_trends, use_container_width=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+        # Category Spending Section
+        with section("Spending by Category", "CAT"):
+            if df_cat is not None:
+                # Create horizontal bar chart
+                fig_cat = px.bar(
+                    df_cat, 
+                    x='total_amount', 
+                    y='category',
+                    orientation='h',
+                    title="Top 10 Categories by Spending",
+                    color='total_amount',
+                    color_continuous_scale='Blues'
+                )
+                fig_cat.update_layout(
+                    title_font_size=16,
+                    font_family="Inter",
+                    title_font_color="#e2e8f0",
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='#e2e8f0',
+                    xaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)'),
+                    yaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)')
+                )
+                st.plotly_chart(fig_cat, use_container_width=True)
+        
+        # Monthly Trends Section
+        with section("Monthly Spending Trends", "TRD"):
+            if df_trends is not None:
+                # Create line chart
+                fig_trends = px.line(
+                    df_trends, 
+                    x='month', 
+                    y='total_amount',
+                    title="Monthly Spending Trends (Last 12 Months)",
+                    markers=True,
+                    render_mode="webgl"
+                )
+                fig_trends.update_layout(
+                    xaxis_title="Month",
+                    yaxis_title="Total Amount ($)",
+                    title_font_size=16,
+                    font_family="Inter",
+                    title_font_color="#e2e8f0",
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='#e2e8f0',
+                    xaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)'),
+                    yaxis=dict(gridcolor='rgba(59, 130, 246, 0.1)')
+                )
+                fig_trends.update_traces(line_color='#3b82f6', marker_color='#60a5fa')
+                if PLOTLY_RESAMPLER_AVAILABLE:
+                    from plotly_resampler import FigureResampler
+                    # Downsample long histories to a fixed number of points before sending to the browser
+                    fig_trends = FigureResampler(fig_trends, default_n_shown_samples=1000)
+                st.plotly_chart(fig_trends, use_container_width=True)
 
 def show_ml_features_page():
     """Display ML features and predictions."""
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">ML</span>Expense Classification & Prediction
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    # ML Model Info Section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">MDL</span>Model Information
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    ml_info = call_api("/ml/info")
-    
-    if ml_info:
-        if ml_info.get('status') == 'ML classifier not available':
-            st.markdown('''
-            <div class="alert-box alert-medium">
-                <strong>NOTICE:</strong> ML classifier not trained yet. Train the model first: <code>py -m src.cli train-ml</code>
-            </div>
-            ''', unsafe_allow_html=True)
-        else:
-            col1, col2, col3 = st.columns(3)
+    with section("Expense Classification & Prediction", "ML"):
+        # ML Model Info Section
+        with section("Model Information", "MDL"):
+            ml_info = call_api("/ml/info")
             
-            with col1:
-                st.metric("Model Accuracy", f"{ml_info.get('accuracy', 0):.1%}")
-            with col2:
-                st.metric("Training Samples", f"{ml_info.get('training_samples', 0):,}")
-            with col3:
-                st.metric("Categories", f"{ml_info.get('categories_count', 0)}")
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+            if ml_info:
+                if ml_info.get('status') == 'ML classifier not available':
+                    st.markdown('''
+                    <div class="alert-box alert-medium">
+                        <strong>NOTICE:</strong> ML classifier not trained yet. Train the model first: <code>py -m src.cli train-ml</code>
+                    </div>
+                    ''', unsafe_allow_html=True)
+                else:
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        st.metric("Model Accuracy", f"{ml_info.get('accuracy', 0):.1%}")
+                    with col2:
+                        st.metric("Training Samples", f"{ml_info.get('training_samples', 0):,}")
+                    with col3:
+                        st.metric("Categories", f"{ml_info.get('categories_count', 0)}")
 
-    # Expense Category Prediction Section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">PRD</span>Expense Category Prediction
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    with st.form("prediction_form"):
+        # Expense Category Prediction Section
+        with section("Expense Category Prediction", "PRD"):
+            with st.form("prediction_form"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    vendor = st.text_input("Vendor Name", placeholder="e.g., Microsoft Azure")
+                
+                with col2:
+                    description = st.text_input("Description (optional)", placeholder="e.g., Cloud hosting services")
+                
+                predict_button = st.form_submit_button("Predict Category", use_container_width=True)
+                
+                if predict_button and vendor:
+                    prediction = predict_category(vendor, description)
+                    
+                    if prediction:
+                        st.success(f"**PREDICTION:** Category: **{prediction['predicted_category']}**  \n**CONFIDENCE:** {prediction['confidence']:.1%}  \n**MODEL:** {prediction['model_info']}")
+                    else:
+                        st.error("Prediction failed. Please try again.")
+
+def float_column(records: List[Dict], field: str, default: float) -> np.ndarray:
+    """Pull one numeric field out of a list of records into a pre-sized float array."""
+    return np.fromiter(
+        (record.get(field, default) for record in records),
+        dtype=np.float64,
+        count=len(records)
+    )
+
+TREND_LABELS = {'increasing': "📈 Increasing", 'decreasing': "📉 Decreasing"}
+
+def forecast_table(forecasts: Dict[str, Dict], label: str):
+    """Tabulate per-category or per-department forecasts for a single st.dataframe."""
+    df = pd.DataFrame.from_dict(forecasts, orient='index').reindex(
+        columns=['total_forecast', 'monthly_average', 'trend']
+    )
+    table = pd.DataFrame({
+        label: df.index,
+        'Total Forecast': df['total_forecast'].fillna(0).to_numpy(),
+        'Monthly Average': df['monthly_average'].fillna(0).to_numpy(),
+        'Trend': df['trend'].map(lambda trend: TREND_LABELS.get(trend, "➡️ Stable")).to_numpy()
+    })
+    return table.style.format({'Total Forecast': '${:,.0f}', 'Monthly Average': '${:,.0f}'})
+
+def truncate_payload(payload: Dict, max_keys: int = 20, max_items: int = 100) -> Dict:
+    """Trim a JSON payload for display: the first max_keys keys, with long lists cut to max_items."""
+    return {
+        key: value[:max_items] if isinstance(value, list) else value
+        for key, value in islice(payload.items(), max_keys)
+    }
+
+def show_forecasting_page():
+    """Display budget forecasting features."""
+    with section("Budget Forecasting & Trends", "FOR"):
+        # Forecasting Controls Section
+        with section("Generate Spending Forecast", "GEN"):
+            _forecast_panel()
+
+@st.fragment
+def _forecast_panel():
+    """Forecast controls and results; submitting the form reruns only this block."""
+    # Sliders inside a form do not rerun the script until the form is submitted
+    with st.form("forecast_form", border=False):
         col1, col2 = st.columns(2)
         
         with col1:
-            vendor = st.text_input("Vendor Name", placeholder="e.g., Microsoft Azure")
+            forecast_months = st.slider("Forecast Period (months)", 1, 12, 6)
         
         with col2:
-            description = st.text_input("Description (optional)", placeholder="e.g., Cloud hosting services")
+            confidence_level = st.slider("Confidence Level", 0.80, 0.99, 0.95, 0.01)
         
-        predict_button = st.form_submit_button("Predict Category", use_container_width=True)
-        
-        if predict_button and vendor:
-            prediction = call_api("/ml/predict", "POST", {
-                "vendor": vendor,
-                "description": description
-            })
-            
-            if prediction:
-                st.markdown(f'''
-                <div class="success-box">
-                    <strong>PREDICTION:</strong> Category: <strong>{prediction['predicted_category']}</strong><br>
-                    <strong>CONFIDENCE:</strong> {prediction['confidence']:.1%}<br>
-                    <strong>MODEL:</strong> {prediction['model_info']}
-                </div>
-                ''', unsafe_allow_html=True)
-            else:
-                st.markdown('''
-                <div class="alert-box alert-high">
-                    <strong>ERROR:</strong> Prediction failed. Please try again.
-                </div>
-                ''', unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-def show_forecasting_page():
-    """Display budget forecasting features."""
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">FOR</span>Budget Forecasting & Trends
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    # Forecasting Controls Section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">GEN</span>Generate Spending Forecast
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        forecast_months = st.slider("Forecast Period (months)", 1, 12, 6)
-    
-    with col2:
-        confidence_level = st.slider("Confidence Level", 0.80, 0.99, 0.95, 0.01)
+        show_raw = st.checkbox("Show raw forecast (debug)", value=False)
+        submitted = st.form_submit_button("Generate Forecast", use_container_width=True)
         
-    if st.button("Generate Forecast", use_container_width=True):
+    if submitted:
         with st.spinner("Generating forecast..."):
             forecast_data = call_api("/forecast/spending", "POST", {
                 "months": forecast_months,
@@ -745,14 +730,7 @@ def show_forecasting_page():
             })
             
             if forecast_data:
-                st.markdown('''
-                <div class="success-box">
-                    <strong>SUCCESS:</strong> Forecast generated successfully!
-                </div>
-                ''', unsafe_allow_html=True)
-                
-                # Debug: Show the forecast data structure
-                st.write("Debug - Forecast data keys:", list(forecast_data.keys()) if isinstance(forecast_data, dict) else type(forecast_data))
+                st.success("Forecast generated successfully!")
                 
                 # Display forecast results immediately
                 if isinstance(forecast_data, dict):
@@ -792,73 +770,77 @@ def show_forecasting_page():
                     if monthly_forecasts:
                         st.subheader("Monthly Breakdown")
                         
-                        # Create DataFrame for monthly forecasts
-                        monthly_data = []
-                        for forecast in monthly_forecasts:
-                            monthly_data.append({
-                                'Month': forecast.get('month', 'Unknown'),
-                                'Predicted Amount': f"${forecast.get('predicted_amount', 0):,.0f}",
-                                'Lower Bound': f"${forecast.get('confidence_lower', 0):,.0f}",
-                                'Upper Bound': f"${forecast.get('confidence_upper', 0):,.0f}",
-                                'Seasonal Factor': f"{forecast.get('seasonal_factor', 1.0):.2f}"
-                            })
-                        
-                        df_monthly = pd.DataFrame(monthly_data)
-                        st.dataframe(df_monthly, use_container_width=True)
+                        # Build the table column-wise; numbers stay numeric and are formatted for display only
+                        df_monthly = pd.DataFrame({
+                            'Month': [forecast.get('month', 'Unknown') for forecast in monthly_forecasts],
+                            'Predicted Amount': float_column(monthly_forecasts, 'predicted_amount', 0),
+                            'Lower Bound': float_column(monthly_forecasts, 'confidence_lower', 0),
+                            'Upper Bound': float_column(monthly_forecasts, 'confidence_upper', 0),
+                            'Seasonal Factor': float_column(monthly_forecasts, 'seasonal_factor', 1.0)
+                        })
+                        st.dataframe(
+                            df_monthly.style.format({
+                                'Predicted Amount': '${:,.0f}',
+                                'Lower Bound': '${:,.0f}',
+                                'Upper Bound': '${:,.0f}',
+                                'Seasonal Factor': '{:.2f}'
+                            }),
+                            use_container_width=True
+                        )
                     
                     # Display category forecasts if available
                     category_forecasts = forecast_data.get('category_forecasts', {})
                     if category_forecasts:
                         st.subheader("Category Forecasts")
                         
-                        for category, data in category_forecasts.items():
-                            col1, col2, col3, col4 = st.columns(4)
-                            with col1:
-                                st.write(f"**{category}**")
-                            with col2:
-                                st.write(f"${data.get('total_forecast', 0):,.0f}")
-                            with col3:
-                                st.write(f"${data.get('monthly_average', 0):,.0f}")
-                            with col4:
-                                trend = data.get('trend', 'stable')
-                                if trend == 'increasing':
-                                    st.write("📈 Increasing")
-                                elif trend == 'decreasing':
-                                    st.write("📉 Decreasing")
-                                else:
-                                    st.write("➡️ Stable")
+                        st.dataframe(
+                            forecast_table(category_forecasts, "Category"),
+                            use_container_width=True,
+                            hide_index=True
+                        )
                     
                     # Display department forecasts if available
                     department_forecasts = forecast_data.get('department_forecasts', {})
                     if department_forecasts:
                         st.subheader("Department Forecasts")
                         
-                        for department, data in department_forecasts.items():
-                            col1, col2, col3, col4 = st.columns(4)
-                            with col1:
-                                st.write(f"**{department}**")
-                            with col2:
-                                st.write(f"${data.get('total_forecast', 0):,.0f}")
-                            with col3:
-                                st.write(f"${data.get('monthly_average', 0):,.0f}")
-                            with col4:
-                                trend = data.get('trend', 'stable')
-                                if trend == 'increasing':
-                                    st.write("📈 Increasing")
-                                elif trend == 'decreasing':
-                                    st.write("📉 Decreasing")
-                                else:
-                                    st.write("➡️ Stable")
+                        st.dataframe(
+                            forecast_table(department_forecasts, "Department"),
+                            use_container_width=True,
+                            hide_index=True
+                        )
                     
-                    # Show all available forecast data for debugging
-                    with st.expander("Debug: Raw Forecast Data"):
-                        st.json(forecast_data)
+                    # Raw payload is opt-in and trimmed, so large forecasts are not sent on every run
+                    if show_raw:
+                        st.json(truncate_payload(forecast_data), expanded=False)
                 
                 else:
                     st.error("No forecast data received. Please try again.")
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+
+SEVERITY_CLASSES = {
+    'High': 'alert-high',
+    'Medium': 'alert-medium',
+    'Low': 'alert-low'
+}
+ANOMALY_MIN_SCORE = 0.5
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_anomaly_scores(min_score: float) -> Tuple[Optional[Dict], Optional[str]]:
+    """Fetch every anomaly scoring at least min_score; cached so threshold changes never re-run the model."""
+    return _fetch(f"/anomalies/scores?min_score={min_score}")
+
+def summarize_anomalies(scores: Dict, threshold: float) -> Dict:
+    """Apply a detection threshold to pre-computed scores, in the /anomalies/detect response shape."""
+    # Scores arrive sorted highest first, so the filtered list keeps that order
+    anomalies = [anomaly for anomaly in scores['anomalies'] if anomaly['anomaly_score'] >= threshold]
+    total = scores['total_expenses']
+    return {
+        'total_expenses': total,
+        'anomalies_detected': len(anomalies),
+        'anomaly_rate': len(anomalies) / total * 100 if total else 0,
+        'severity_breakdown': dict(Counter(anomaly['severity'] for anomaly in anomalies)),
+        'anomalies': anomalies
+    }
 
 def show_anomaly_detection_page():
     """Display anomaly detection and alerts."""
@@ -870,18 +852,29 @@ def show_anomaly_detection_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        threshold = st.slider("Detection Sensitivity", 0.5, 0.9, 0.6, 0.05)
+        threshold = st.slider("Detection Sensitivity", ANOMALY_MIN_SCORE, 0.9, 0.6, 0.05)
         st.caption("Lower = More sensitive (more alerts)")
     
     with col2:
         save_report = st.checkbox("Save detailed report")
     
-    if st.button("Scan for Anomalies", use_container_width=True):
+    scan_clicked = st.button("Scan for Anomalies", use_container_width=True)
+    if scan_clicked:
+        st.session_state.anomaly_scanned = True
+    
+    # Scores are fetched once; moving the slider afterwards only re-filters them
+    if st.session_state.get('anomaly_scanned'):
         with st.spinner("Scanning for anomalies..."):
-            anomaly_data = call_api("/anomalies/detect", "POST", {
-                "threshold": threshold,
-                "save_report": save_report
-            })
+            if scan_clicked and save_report:
+                anomaly_data = call_api("/anomalies/detect", "POST", {
+                    "threshold": threshold,
+                    "save_report": save_report
+                })
+            else:
+                scores, error = fetch_anomaly_scores(ANOMALY_MIN_SCORE)
+                if error:
+                    _show_api_error(error)
+                anomaly_data = summarize_anomalies(scores, threshold) if scores else None
             
             if anomaly_data:
                 # Summary metrics
@@ -913,21 +906,53 @@ def show_anomaly_detection_page():
                 if anomaly_data.get('anomalies'):
                     st.subheader("🔴 Top Anomalies Detected")
                     
-                    for i, anomaly in enumerate(anomaly_data['anomalies'][:5], 1):
-                        severity_color = {
-                            'High': 'alert-high',
-                            'Medium': 'alert-medium',
-                            'Low': 'alert-low'
-                        }.get(anomaly['severity'], 'alert-low')
-                        
-                        st.markdown(f'''
-                        <div class="alert-box {severity_color}">
+                    # One markdown message for all cards instead of one per anomaly
+                    st.markdown("".join(f'''
+                        <div class="alert-box {SEVERITY_CLASSES.get(anomaly['severity'], 'alert-low')}">
                             <strong>#{i} - {anomaly['severity']} Priority</strong><br>
                             <strong>${anomaly['amount']:,.0f}</strong> - {anomaly['vendor']} ({anomaly['department']})<br>
                             Date: {anomaly['date']} | Score: {anomaly['anomaly_score']:.2f}<br>
                             Reasons: {", ".join(anomaly['reasons'])}
                         </div>
-                        ''', unsafe_allow_html=True)
+                        ''' for i, anomaly in enumerate(anomaly_data['anomalies'][:5], 1)), unsafe_allow_html=True)
+
+def post_bulk(endpoint: str, items: List[Dict]) -> Optional[Dict]:
+    """POST queued records to a bulk endpoint in one request; never cached, since it writes."""
+    try:
+        response = get_session().post(f"{API_BASE_URL}{endpoint}", json={"items": items}, timeout=30)
+        response.raise_for_status()
+        return parse_json(response.content)
+    except requests.exceptions.ConnectionError:
+        _show_api_error("connection")
+    except requests.exceptions.Timeout:
+        _show_api_error("timeout")
+    except Exception as e:
+        _show_api_error(f"❌ API Error: {str(e)}")
+    return None
+
+def pending_batch(key: str, endpoint: str, label: str):
+    """Show the records queued under st.session_state[key] and submit them with one bulk request."""
+    pending = st.session_state.get(key)
+    if not pending:
+        return
+    
+    st.markdown(f"**{len(pending)} {label} queued**")
+    col1, col2 = st.columns(2)
+    
+    if col1.button(f"Submit {len(pending)} {label.title()}", key=f"{key}_submit", use_container_width=True, type="primary"):
+        result = post_bulk(endpoint, pending)
+        if result:
+            # Rows the server rejected stay queued so they can be fixed or cleared
+            pending = [item for item, outcome in zip(pending, result['results']) if not outcome['success']]
+            st.session_state[key] = pending
+            st.success(f"{result['created']} {label} added" + (f", {result['failed']} failed" if result['failed'] else ""))
+            st.cache_data.clear()
+    
+    if col2.button("Clear Batch", key=f"{key}_clear", use_container_width=True):
+        st.session_state[key] = pending = []
+    
+    if pending:
+        st.dataframe(pd.DataFrame(pending), use_container_width=True, hide_index=True)
 
 def show_data_management_page():
     """Display data management features with multi-currency support."""
@@ -938,276 +963,267 @@ def show_data_management_page():
     </div>
     ''', unsafe_allow_html=True)
     
-    # Currency options for Nsight operations
-    currency_options = {
-        "USD": "US Dollar (USD)",
-        "INR": "Indian Rupee (INR)", 
-        "CAD": "Canadian Dollar (CAD)",
-        "TRY": "Turkish Lira (TRY)"
-    }
-    
     # Tabs for different management features
     tab1, tab2, tab3, tab4 = st.tabs(["Add Expense", "Add Budget", "Import Expenses", "Import Budgets"])
     
     # Tab 1: Add New Expense
     with tab1:
-        st.markdown('''
-        <div class="section-container">
-            <div class="section-header">
-                Add New Expense
-            </div>
-        ''', unsafe_allow_html=True)
-        
-        with st.form("add_expense_form"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                expense_date = st.date_input("Date", datetime.now())
-                amount = st.number_input("Amount", min_value=0.01, step=0.01)
-                currency = st.selectbox("Currency", options=list(currency_options.keys()), 
-                                      format_func=lambda x: currency_options[x])
-                vendor = st.text_input("Vendor")
-            
-            with col2:
-                description = st.text_input("Description")
-                department = st.selectbox("Department", [
-                    "Engineering", "Marketing", "Sales", "HR", "Finance", "Operations", "Executive"
-                ])
-                category = st.selectbox("Category", [
-                    "IT Infrastructure", "Marketing", "Travel", "Office Supplies", 
-                    "Personnel", "Utilities", "Professional Services", "Training", 
-                    "Equipment", "Other"
-                ])
+        with section("Add New Expense"):
+            batch_expenses = st.checkbox("Batch mode", key="batch_expenses",
+                                         help="Queue expenses here and submit them together in one request")
             
-            if st.form_submit_button("Add Expense", use_container_width=True):
-                expense_data = {
-                    "date": expense_date.strftime("%Y-%m-%d"),
-                    "amount": amount,
-                    "currency": currency,
-                    "vendor": vendor,
-                    "description": description,
-                    "department": department,
-                    "category": category
-                }
+            with st.form("add_expense_form"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    expense_date = st.date_input("Date", datetime.now())
+                    amount = st.number_input("Amount", min_value=0.01, step=0.01)
+                    currency = st.selectbox("Currency", options=CURRENCY_KEYS, 
+                                          format_func=_CCY_FMT)
+                    vendor = st.text_input("Vendor")
                 
-                result = call_api("/expenses", "POST", expense_data)
+                with col2:
+                    description = st.text_input("Description")
+                    department = st.selectbox("Department", DEPARTMENTS)
+                    category = st.selectbox("Category", CATEGORIES)
                 
-                if result:
-                    st.markdown('''
-                    <div class="success-box">
-                        <strong>SUCCESS:</strong> Expense added successfully!
-                    </div>
-                    ''', unsafe_allow_html=True)
-                    st.cache_data.clear()
-                else:
-                    st.markdown('''
-                    <div class="alert-box alert-high">
-                        <strong>ERROR:</strong> Failed to add expense
-                    </div>
-                    ''', unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+                if st.form_submit_button(f"{'Queue' if batch_expenses else 'Add'} Expense", use_container_width=True):
+                    expense_data = {
+                        "date": expense_date.strftime("%Y-%m-%d"),
+                        "amount": amount,
+                        "currency": currency,
+                        "vendor": vendor,
+                        "description": description,
+                        "department": department,
+                        "category": category
+                    }
+                    
+                    if batch_expenses:
+                        st.session_state.setdefault("pending_expenses", []).append(expense_data)
+                    else:
+                        result = call_api("/expenses", "POST", expense_data)
+                        
+                        if result:
+                            st.success("Expense added successfully!")
+                            st.cache_data.clear()
+                        else:
+                            st.error("Failed to add expense")
+            
+            pending_batch("pending_expenses", "/expenses/bulk", "expenses")
     
     # Tab 2: Add New Budget
     with tab2:
-        st.markdown('''
-        <div class="section-container">
-            <div class="section-header">
-                Add New Budget
-            </div>
-        ''', unsafe_allow_html=True)
-        
-        with st.form("add_budget_form"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                budget_department = st.selectbox("Department", [
-                    "Engineering", "Marketing", "Sales", "HR", "Finance", "Operations", "Executive"
-                ], key="budget_dept")
-                budget_category = st.selectbox("Category", [
-                    "IT Infrastructure", "Marketing", "Travel", "Office Supplies", 
-                    "Personnel", "Utilities", "Professional Services", "Training", 
-                    "Equipment", "Other"
-                ], key="budget_cat")
-            
-            with col2:
-                period_start = st.date_input("Period Start", datetime.now().replace(day=1))
-                period_end = st.date_input("Period End", datetime.now().replace(day=28))
-                allocated_amount = st.number_input("Allocated Amount", min_value=0.01, step=0.01)
-                budget_currency = st.selectbox("Currency", options=list(currency_options.keys()), 
-                                             format_func=lambda x: currency_options[x], key="budget_currency")
+        with section("Add New Budget"):
+            batch_budgets = st.checkbox("Batch mode", key="batch_budgets",
+                                        help="Queue budgets here and submit them together in one request")
             
-            if st.form_submit_button("Add Budget", use_container_width=True):
-                budget_data = {
-                    "department": budget_department,
-                    "category": budget_category,
-                    "period_start": period_start.strftime("%Y-%m-%d"),
-                    "period_end": period_end.strftime("%Y-%m-%d"),
-                    "allocated_amount": allocated_amount,
-                    "currency": budget_currency
-                }
+            with st.form("add_budget_form"):
+                col1, col2 = st.columns(2)
                 
-                result = call_api("/budgets", "POST", budget_data)
+                with col1:
+                    budget_department = st.selectbox("Department", DEPARTMENTS, key="budget_dept")
+                    budget_category = st.selectbox("Category", CATEGORIES, key="budget_cat")
                 
-                if result:
-                    st.markdown('''
-                    <div class="success-box">
-                        <strong>SUCCESS:</strong> Budget added successfully!
-                    </div>
-                    ''', unsafe_allow_html=True)
-                    st.cache_data.clear()
-                else:
-                    st.markdown('''
-                    <div class="alert-box alert-high">
-                        <strong>ERROR:</strong> Failed to add budget
-                    </div>
-                    ''', unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Tab 3: Import Expenses CSV
-    with tab3:
-        st.markdown('''
-        <div class="section-container">
-            <div class="section-header">
-                Import Expenses from CSV
-            </div>
-        ''', unsafe_allow_html=True)
-        
-        st.markdown('''
-        <div class="alert-box alert-low">
-            <strong>CSV FORMAT:</strong> Your CSV should include columns: date, amount, currency, vendor, description, department, category<br>
-            <strong>EXAMPLE:</strong> 2024-01-15, 150.00, USD, Microsoft, Azure subscription, Engineering, IT Infrastructure
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            expense_file = st.file_uploader("Choose CSV file", type="csv", key="expense_csv")
-        
-        with col2:
-            default_expense_currency = st.selectbox("Default Currency", 
-                                                   options=list(currency_options.keys()),
-                                                   format_func=lambda x: currency_options[x],
-                                                   key="default_exp_currency")
-        
-        if expense_file is not None and st.button("Import Expenses", use_container_width=True):
-            with st.spinner("Importing expenses..."):
-                files = {"file": expense_file}
-                data = {"default_currency": default_expense_currency}
+                with col2:
+                    period_start = st.date_input("Period Start", datetime.now().replace(day=1))
+                    period_end = st.date_input("Period End", datetime.now().replace(day=28))
+                    allocated_amount = st.number_input("Allocated Amount", min_value=0.01, step=0.01)
+                    budget_currency = st.selectbox("Currency", options=CURRENCY_KEYS, 
+                                                 format_func=_CCY_FMT, key="budget_currency")
                 
-                try:
-                    import requests
-                    response = requests.post(f"{API_BASE_URL}/expenses/import", files=files, data=data)
+                if st.form_submit_button(f"{'Queue' if batch_budgets else 'Add'} Budget", use_container_width=True):
+                    budget_data = {
+                        "department": budget_department,
+                        "category": budget_category,
+                        "period_start": period_start.strftime("%Y-%m-%d"),
+                        "period_end": period_end.strftime("%Y-%m-%d"),
+                        "allocated_amount": allocated_amount,
+                        "currency": budget_currency
+                    }
                     
-                    if response.status_code == 200:
-                        result = response.json()
-                        if result.get("success"):
-                            st.markdown(f'''
-                            <div class="success-box">
-                                <strong>SUCCESS:</strong> {result.get("message", "Import completed")}<br>
-                                <strong>RECORDS PROCESSED:</strong> {result.get("records_processed", 0)}
-                            </div>
-                            ''', unsafe_allow_html=True)
+                    if batch_budgets:
+                        st.session_state.setdefault("pending_budgets", []).append(budget_data)
+                    else:
+                        result = call_api("/budgets", "POST", budget_data)
+                        
+                        if result:
+                            st.success("Budget added successfully!")
                             st.cache_data.clear()
                         else:
-                            st.markdown(f'''
-                            <div class="alert-box alert-high">
-                                <strong>ERROR:</strong> {result.get("message", "Import failed")}
-                            </div>
-                            ''', unsafe_allow_html=True)
-                            if result.get("errors"):
-                                with st.expander("View Errors"):
-                                    for error in result["errors"]:
-                                        st.write(f"• {error}")
-                    else:
-                        st.markdown('''
-                        <div class="alert-box alert-high">
-                            <strong>ERROR:</strong> Failed to upload file
-                        </div>
-                        ''', unsafe_allow_html=True)
+                            st.error("Failed to add budget")
+            
+            pending_batch("pending_budgets", "/budgets/bulk", "budgets")
+    
+    # Tab 3: Import Expenses CSV
+    with tab3:
+        with section("Import Expenses from CSV"):
+            st.markdown('''
+            <div class="alert-box alert-low">
+                <strong>CSV FORMAT:</strong> Your CSV should include columns: date, amount, currency, vendor, description, department, category<br>
+                <strong>EXAMPLE:</strong> 2024-01-15, 150.00, USD, Microsoft, Azure subscription, Engineering, IT Infrastructure
+            </div>
+            ''', unsafe_allow_html=True)
+            
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                expense_file = st.file_uploader("Choose CSV file", type="csv", key="expense_csv")
+            
+            with col2:
+                default_expense_currency = st.selectbox("Default Currency", 
+                                                       options=CURRENCY_KEYS,
+                                                       format_func=_CCY_FMT,
+                                                       key="default_exp_currency")
+            
+            # Check the file locally so a malformed CSV is never uploaded
+            expense_preview, expense_error = (None, None) if expense_file is None else validate_csv(expense_file, EXPENSE_CSV_COLUMNS)
+            if expense_error:
+                st.error(expense_error)
+            elif expense_preview is not None:
+                with st.expander(f"Preview (first {len(expense_preview)} rows)"):
+                    st.dataframe(shrink_frame(expense_preview), use_container_width=True, hide_index=True)
+            
+            if expense_preview is not None and st.button("Import Expenses", use_container_width=True):
+                with st.spinner("Importing expenses..."):
+                    try:
+                        response = upload_csv("/expenses/import", expense_file, default_expense_currency)
                         
-                except Exception as e:
-                    st.markdown(f'''
-                    <div class="alert-box alert-high">
-                        <strong>ERROR:</strong> {str(e)}
-                    </div>
-                    ''', unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+                        if response.status_code == 200:
+                            result = parse_json(response.content)
+                            if result.get("success"):
+                                st.success(f'{result.get("message", "Import completed")}  \n**RECORDS PROCESSED:** {result.get("records_processed", 0)}')
+                                st.cache_data.clear()
+                            else:
+                                st.error(result.get("message", "Import failed"))
+                                if result.get("errors"):
+                                    show_import_errors(result["errors"])
+                        else:
+                            st.error("Failed to upload file")
+                            
+                    except Exception as e:
+                        st.error(str(e))
     
     # Tab 4: Import Budgets CSV
     with tab4:
-        st.markdown('''
-        <div class="section-container">
-            <div class="section-header">
-                Import Budgets from CSV
+        with section("Import Budgets from CSV"):
+            st.markdown('''
+            <div class="alert-box alert-low">
+                <strong>CSV FORMAT:</strong> Your CSV should include columns: department, category, period_start, period_end, allocated_amount, currency<br>
+                <strong>EXAMPLE:</strong> Engineering, IT Infrastructure, 2024-01-01, 2024-01-31, 50000.00, USD
             </div>
-        ''', unsafe_allow_html=True)
-        
-        st.markdown('''
-        <div class="alert-box alert-low">
-            <strong>CSV FORMAT:</strong> Your CSV should include columns: department, category, period_start, period_end, allocated_amount, currency<br>
-            <strong>EXAMPLE:</strong> Engineering, IT Infrastructure, 2024-01-01, 2024-01-31, 50000.00, USD
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            budget_file = st.file_uploader("Choose CSV file", type="csv", key="budget_csv")
-        
-        with col2:
-            default_budget_currency = st.selectbox("Default Currency", 
-                                                  options=list(currency_options.keys()),
-                                                  format_func=lambda x: currency_options[x],
-                                                  key="default_bud_currency")
-        
-        if budget_file is not None and st.button("Import Budgets", use_container_width=True):
-            with st.spinner("Importing budgets..."):
-                files = {"file": budget_file}
-                data = {"default_currency": default_budget_currency}
-                
-                try:
-                    import requests
-                    response = requests.post(f"{API_BASE_URL}/budgets/import", files=files, data=data)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        if result.get("success"):
-                            st.markdown(f'''
-                            <div class="success-box">
-                                <strong>SUCCESS:</strong> {result.get("message", "Import completed")}<br>
-                                <strong>RECORDS PROCESSED:</strong> {result.get("records_processed", 0)}
-                            </div>
-                            ''', unsafe_allow_html=True)
-                            st.cache_data.clear()
-                        else:
-                            st.markdown(f'''
-                            <div class="alert-box alert-high">
-                                <strong>ERROR:</strong> {result.get("message", "Import failed")}
-                            </div>
-                            ''', unsafe_allow_html=True)
-                            if result.get("errors"):
-                                with st.expander("View Errors"):
-                                    for error in result["errors"]:
-                                        st.write(f"• {error}")
-                    else:
-                        st.markdown('''
-                        <div class="alert-box alert-high">
-                            <strong>ERROR:</strong> Failed to upload file
-                        </div>
-                        ''', unsafe_allow_html=True)
+            ''', unsafe_allow_html=True)
+            
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                budget_file = st.file_uploader("Choose CSV file", type="csv", key="budget_csv")
+            
+            with col2:
+                default_budget_currency = st.selectbox("Default Currency", 
+                                                      options=CURRENCY_KEYS,
+                                                      format_func=_CCY_FMT,
+                                                      key="default_bud_currency")
+            
+            # Check the file locally so a malformed CSV is never uploaded
+            budget_preview, budget_error = (None, None) if budget_file is None else validate_csv(budget_file, BUDGET_CSV_COLUMNS)
+            if budget_error:
+                st.error(budget_error)
+            elif budget_preview is not None:
+                with st.expander(f"Preview (first {len(budget_preview)} rows)"):
+                    st.dataframe(shrink_frame(budget_preview), use_container_width=True, hide_index=True)
+            
+            if budget_preview is not None and st.button("Import Budgets", use_container_width=True):
+                with st.spinner("Importing budgets..."):
+                    try:
+                        response = upload_csv("/budgets/import", budget_file, default_budget_currency)
                         
-                except Exception as e:
-                    st.markdown(f'''
-                    <div class="alert-box alert-high">
-                        <strong>ERROR:</strong> {str(e)}
-                    </div>
-                    ''', unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+                        if response.status_code == 200:
+                            result = parse_json(response.content)
+                            if result.get("success"):
+                                st.success(f'{result.get("message", "Import completed")}  \n**RECORDS PROCESSED:** {result.get("records_processed", 0)}')
+                                st.cache_data.clear()
+                            else:
+                                st.error(result.get("message", "Import failed"))
+                                if result.get("errors"):
+                                    show_import_errors(result["errors"])
+                        else:
+                            st.error("Failed to upload file")
+                            
+                    except Exception as e:
+                        st.error(str(e))
+
+def shrink_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink a preview table before it is serialized: small integer ids and categorical labels."""
+    for column in ('id', 'expense_id', 'budget_id'):
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+    for column in ('currency', 'department', 'category', 'severity'):
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+def _multi(selected: List[str], sentinel: str) -> Optional[str]:
+    """Comma-join a multi-select for the API; None when nothing or the "all" sentinel is selected."""
+    return None if not selected or sentinel in selected else ",".join(selected)
+
+def preview_frame(records: List[Dict]) -> pd.DataFrame:
+    """Build a download preview table, with the API's ISO date strings typed for its DateColumn config."""
+    df = shrink_frame(pd.DataFrame(records))
+    for column in ('date', 'period_start', 'period_end'):
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column]).dt.date
+    return df
+
+def preview_key(params: Dict, limit: int, page: int = 1) -> Tuple:
+    """Hashable, order-independent cache key for one page of a preview request."""
+    return tuple(sorted({**params, 'limit': limit, 'offset': (page - 1) * limit}.items()))
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_preview(endpoint: str, params: Tuple) -> Tuple[Optional[List[Dict]], Optional[str]]:
+    """Fetch preview records for one filter combination and return (records, error)."""
+    payload, error = _fetch(f"{endpoint}?{urlencode(params)}")
+    if isinstance(payload, dict):
+        # /expenses wraps its rows in 'data', /budgets in 'budgets'
+        payload = payload.get('data', payload.get('budgets', []))
+    return payload, error
+
+def download_bytes(url: str, params: Dict) -> bytes:
+    """Stream a GET response into memory in DOWNLOAD_CHUNK_BYTES chunks; HTTP errors raise."""
+    with get_session().get(url, params=params, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        buffer = BytesIO()
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+            buffer.write(chunk)
+        return buffer.getvalue()
+
+def fetch_export_table(url: str, params: Dict):
+    """Download an export as an Arrow table; None when the server cannot serve this export as Arrow."""
+    try:
+        data = download_bytes(url, {**params, 'format': 'arrow'})
+    except requests.exceptions.HTTPError:
+        return None
+    return feather.read_table(BytesIO(data))
+
+def encode_table(table, fmt: str) -> bytes:
+    """Write an Arrow table as the CSV or JSON file the API would have produced."""
+    if fmt == "csv":
+        sink = BytesIO()
+        pacsv.write_csv(table, sink)
+        return sink.getvalue()
+    return json.dumps(table.to_pylist(), indent=2, default=str).encode()
+
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def fetch_export_bytes(url: str, params: Tuple) -> bytes:
+    """Download an export once per URL and filter/format tuple; HTTP errors raise so they are not cached."""
+    params = dict(params)
+    
+    # CSV and JSON travel as compact Arrow and are encoded here; Excel keeps the server's formatting
+    if PYARROW_AVAILABLE and params.get('format') in ARROW_EXPORT_FORMATS:
+        table = fetch_export_table(url, params)
+        if table is not None:
+            return encode_table(table, params['format'])
+    
+    return download_bytes(url, params)
 
 def show_download_data_page():
     """Display comprehensive data download features with filtering and preview."""
@@ -1223,225 +1239,188 @@ def show_download_data_page():
         st.session_state.download_filters = {}
     
     # Main container
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">DOWNLOAD</span>Data Export Center
-        </div>
-    ''', unsafe_allow_html=True)
-    
-    # Step 1: Data Type Selection
-    st.markdown("### Step 1: Select Data Type")
-    data_type = st.radio(
-        "What data would you like to download?",
-        ["Expenses Only", "Budgets Only", "Combined Report"],
-        horizontal=True
-    )
-    
-    st.markdown("---")
-    
-    # Step 2: Filter Options
-    st.markdown("### Step 2: Filter Your Data")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("**Date Filters**")
-        date_filter_type = st.selectbox(
-            "Date Range",
-            ["All Time", "Last 30 Days", "Last 3 Months", "This Year", "Custom Range"]
+    with section("Data Export Center", "DOWNLOAD"):
+        # Step 1: Data Type Selection
+        st.markdown("### Step 1: Select Data Type")
+        data_type = st.radio(
+            "What data would you like to download?",
+            ["Expenses Only", "Budgets Only", "Combined Report"],
+            horizontal=True
         )
         
-        start_date = None
-        end_date = None
-        if date_filter_type == "Custom Range":
-            start_date = st.date_input("From Date")
-            end_date = st.date_input("To Date")
-        elif date_filter_type == "Last 30 Days":
-            from datetime import datetime, timedelta
-            end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=30)
-        elif date_filter_type == "Last 3 Months":
-            from datetime import datetime, timedelta
-            end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=90)
-        elif date_filter_type == "This Year":
-            from datetime import datetime
-            end_date = datetime.now().date()
-            start_date = datetime(datetime.now().year, 1, 1).date()
-    
-    with col2:
-        st.markdown("**Currency & Location**")
+        st.markdown("---")
         
-        # Currency filter
-        currency_options = {
-            "ALL": "All Currencies",
-            "USD": "US Dollar (USD)",
-            "INR": "Indian Rupee (INR)", 
-            "CAD": "Canadian Dollar (CAD)",
-            "TRY": "Turkish Lira (TRY)"
-        }
+        # Step 2: Filter Options
+        st.markdown("### Step 2: Filter Your Data")
         
-        selected_currencies = st.multiselect(
-            "Currencies",
-            options=list(currency_options.keys()),
-            default=["ALL"],
-            format_func=lambda x: currency_options[x]
-        )
+        col1, col2, col3 = st.columns(3)
         
-        # Department filter
-        departments = [
-            "All Departments", "Engineering", "Marketing", "Sales", 
-            "Operations", "HR", "Finance", "Legal"
-        ]
-        selected_departments = st.multiselect(
-            "Departments",
-            options=departments,
-            default=["All Departments"]
-        )
+        with col1:
+            st.markdown("**Date Filters**")
+            date_filter_type = st.selectbox(
+                "Date Range",
+                ["All Time", "Last 30 Days", "Last 3 Months", "This Year", "Custom Range"]
+            )
+            
+            start_date = None
+            end_date = None
+            if date_filter_type == "Custom Range":
+                start_date = st.date_input("From Date")
+                end_date = st.date_input("To Date")
+            elif date_filter_type in DATE_RANGES:
+                start_date, end_date = DATE_RANGES[date_filter_type](datetime.now().date())
         
-        # Category filter
-        categories = [
-            "All Categories", "Software & Tools", "Marketing & Advertising",
-            "Travel & Transport", "Office Supplies", "Equipment & Hardware",
-            "Professional Services", "Utilities & Internet", "Training & Education",
-            "Entertainment & Events", "Other"
-        ]
-        selected_categories = st.multiselect(
-            "Categories", 
-            options=categories,
-            default=["All Categories"]
-        )
-    
-    with col3:
-        st.markdown("**Amount & Advanced**")
+        with col2:
+            st.markdown("**Currency & Location**")
+            
+            # Currency filter
+            selected_currencies = st.multiselect(
+                "Currencies",
+                options=FILTER_CURRENCY_KEYS,
+                default=["ALL"],
+                format_func=_FILTER_CCY_FMT
+            )
+            
+            # Department filter
+            selected_departments = st.multiselect(
+                "Departments",
+                options=DEPARTMENT_FILTERS,
+                default=["All Departments"]
+            )
+            
+            # Category filter
+            selected_categories = st.multiselect(
+                "Categories", 
+                options=CATEGORY_FILTERS,
+                default=["All Categories"]
+            )
         
-        # Amount range
-        use_amount_filter = st.checkbox("Filter by Amount Range")
-        min_amount = None
-        max_amount = None
+        with col3:
+            st.markdown("**Amount & Advanced**")
+            
+            # Amount range
+            use_amount_filter = st.checkbox("Filter by Amount Range")
+            min_amount = None
+            max_amount = None
+            
+            if use_amount_filter:
+                amount_range = st.slider(
+                    "Amount Range",
+                    min_value=0,
+                    max_value=10000,
+                    value=(0, 10000),
+                    step=50
+                )
+                min_amount = amount_range[0] if amount_range[0] > 0 else None
+                max_amount = amount_range[1] if amount_range[1] < 10000 else None
+            
+            # Vendor filter
+            vendor_filter = st.text_input("Vendor Contains (optional)", placeholder="e.g., Microsoft, Amazon")
+            
+            # Recurring filter (for expenses)
+            if data_type == "Expenses Only":
+                recurring_filter = st.selectbox(
+                    "Expense Type",
+                    ["All Expenses", "Recurring Only", "One-time Only"]
+                )
         
-        if use_amount_filter:
-            amount_range = st.slider(
-                "Amount Range",
-                min_value=0,
-                max_value=10000,
-                value=(0, 10000),
-                step=50
-            )
-            min_amount = amount_range[0] if amount_range[0] > 0 else None
-            max_amount = amount_range[1] if amount_range[1] < 10000 else None
+        st.markdown("---")
         
-        # Vendor filter
-        vendor_filter = st.text_input("Vendor Contains (optional)", placeholder="e.g., Microsoft, Amazon")
+        # Build API parameters, dropping unset filters
+        params = {key: value for key, value in {
+            'currency': _multi(selected_currencies, "ALL"),
+            'department': _multi(selected_departments, "All Departments"),
+            'category': _multi(selected_categories, "All Categories"),
+            'start_date': start_date and start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date and end_date.strftime('%Y-%m-%d'),
+            'min_amount': min_amount,
+            'max_amount': max_amount,
+            'vendor': vendor_filter or None,
+            'is_recurring': (recurring_filter == "Recurring Only"
+                             if data_type == "Expenses Only" and recurring_filter != "All Expenses" else None)
+        }.items() if value is not None}
         
-        # Recurring filter (for expenses)
-        if data_type == "Expenses Only":
-            recurring_filter = st.selectbox(
-                "Expense Type",
-                ["All Expenses", "Recurring Only", "One-time Only"]
-            )
+        # Step 3: Preview & Format Selection
+        _preview_and_download(data_type, params)
     
-    st.markdown("---")
-    
-    # Step 3: Preview & Format Selection
+    # Tips section
+    st.markdown('''
+    <div class="section-container">
+        <div class="section-header">
+            <span class="icon">TIP</span>Download Tips
+        </div>
+        <div class="alert-box alert-low">
+            <strong>Pro Tips:</strong><br>
+            • Use <strong>CSV</strong> for universal compatibility with Excel, Google Sheets<br>
+            • Use <strong>Excel</strong> for formatted reports with multiple sheets (Combined Report)<br>
+            • Use <strong>JSON</strong> for API integration or custom data processing<br>
+            • Filter by currency to get region-specific reports<br>
+            • Use date ranges for quarterly or annual reports<br>
+            • Custom filenames help organize your downloads
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+@st.fragment
+def _preview_and_download(data_type: str, params: Dict):
+    """Step 3 of the download page; reruns on its own so format and filename changes skip Steps 1-2."""
     st.markdown("### Step 3: Preview & Download")
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
+        preview_page = st.number_input("Preview Page", min_value=1, value=1, step=1)
+        
         # Preview button
         if st.button("Preview Data", use_container_width=True):
             with st.spinner("Loading preview..."):
                 try:
-                    # Build API parameters
-                    params = {}
-                    
-                    # Add currency filter
-                    if "ALL" not in selected_currencies and selected_currencies:
-                        if len(selected_currencies) == 1:
-                            params['currency'] = selected_currencies[0]
-                    
-                    # Add department filter
-                    if "All Departments" not in selected_departments and selected_departments:
-                        if len(selected_departments) == 1:
-                            params['department'] = selected_departments[0]
-                    
-                    # Add category filter  
-                    if "All Categories" not in selected_categories and selected_categories:
-                        if len(selected_categories) == 1:
-                            params['category'] = selected_categories[0]
-                    
-                    # Add date filters
-                    if start_date:
-                        params['start_date'] = start_date.strftime('%Y-%m-%d')
-                    if end_date:
-                        params['end_date'] = end_date.strftime('%Y-%m-%d')
-                    
-                    # Add amount filters
-                    if min_amount:
-                        params['min_amount'] = min_amount
-                    if max_amount:
-                        params['max_amount'] = max_amount
-                    
-                    # Add vendor filter
-                    if vendor_filter:
-                        params['vendor'] = vendor_filter
-                    
-                    # Add recurring filter
-                    if data_type == "Expenses Only" and recurring_filter != "All Expenses":
-                        params['is_recurring'] = recurring_filter == "Recurring Only"
-                    
-                    # Make API call for preview
+                    # Make API call for preview; repeated filter sets are served from the cache
                     if data_type == "Expenses Only":
-                        response = requests.get(f"{API_BASE_URL}/expenses", 
-                                              params={**params, 'limit': 10})
+                        data, error = fetch_preview("/expenses", preview_key(params, 10, preview_page))
                     elif data_type == "Budgets Only":
-                        response = requests.get(f"{API_BASE_URL}/budgets", 
-                                              params={**params, 'limit': 10})
+                        data, error = fetch_preview("/budgets", preview_key(params, 10, preview_page))
                     else:  # Combined
-                        # For combined, we'll get both
-                        exp_response = requests.get(f"{API_BASE_URL}/expenses", 
-                                                  params={**params, 'limit': 5})
-                        bud_response = requests.get(f"{API_BASE_URL}/budgets", 
-                                                  params={**params, 'limit': 5})
+                        # For combined, we'll get both; the two requests overlap on the wire
+                        exp_data, bud_data = _gather(fetch_preview, [
+                            ("/expenses", preview_key(params, 5, preview_page)),
+                            ("/budgets", preview_key(params, 5, preview_page))
+                        ])
                     
                     if data_type != "Combined Report":
-                        if response.status_code == 200:
-                            data = response.json()
-                            if data:
-                                st.success(f"Found {len(data)} records matching your criteria")
-                                
-                                # Show preview table
-                                st.markdown("**Preview (First 10 records):**")
-                                df = pd.DataFrame(data)
-                                st.dataframe(df, use_container_width=True)
-                                
-                                # Store preview data for download
-                                st.session_state.preview_data = data
-                                st.session_state.preview_params = params
-                                
-                            else:
-                                st.warning("No data found matching your criteria. Try adjusting your filters.")
+                        if error:
+                            _show_api_error(error)
+                        elif data:
+                            st.success(f"Found {len(data)} records matching your criteria")
+                            
+                            # Show preview table
+                            st.markdown(f"**Preview (Page {preview_page}):**")
+                            df = preview_frame(data)
+                            st.dataframe(df, use_container_width=True, hide_index=True,
+                                         column_config=PREVIEW_COLS_EXPENSE if data_type == "Expenses Only" else PREVIEW_COLS_BUDGET)
+                            
+                            # Store preview data for download
+                            st.session_state.preview_data = data
+                            st.session_state.preview_params = params
+                            
                         else:
-                            st.error(f"Failed to load preview: {response.status_code}")
+                            st.warning("No data found matching your criteria. Try adjusting your filters.")
                     else:
                         # Handle combined preview
-                        if exp_response.status_code == 200 and bud_response.status_code == 200:
-                            exp_data = exp_response.json()
-                            bud_data = bud_response.json()
-                            
+                        if exp_data is not None and bud_data is not None:
                             st.success(f"Found {len(exp_data)} expenses and {len(bud_data)} budgets")
                             
                             if exp_data:
                                 st.markdown("**Expenses Preview:**")
-                                df_exp = pd.DataFrame(exp_data)
-                                st.dataframe(df_exp, use_container_width=True)
+                                df_exp = preview_frame(exp_data)
+                                st.dataframe(df_exp, use_container_width=True, hide_index=True,
+                                             column_config=PREVIEW_COLS_EXPENSE)
                             
                             if bud_data:
                                 st.markdown("**Budgets Preview:**")
-                                df_bud = pd.DataFrame(bud_data)
-                                st.dataframe(df_bud, use_container_width=True)
+                                df_bud = preview_frame(bud_data)
+                                st.dataframe(df_bud, use_container_width=True, hide_index=True,
+                                             column_config=PREVIEW_COLS_BUDGET)
                             
                             st.session_state.preview_params = params
                         
@@ -1467,33 +1446,37 @@ def show_download_data_page():
     
     download_col1, download_col2, download_col3 = st.columns([1, 2, 1])
     
+    # Build download parameters
+    download_params = {**st.session_state.get('preview_params', {}), 'format': export_format.lower()}
+    if data_type == "Expenses Only":
+        download_url = f"{API_BASE_URL}/export/expenses"
+    elif data_type == "Budgets Only":
+        download_url = f"{API_BASE_URL}/export/budgets"
+    else:
+        download_url = f"{API_BASE_URL}/export/combined"
+    export_key = (download_url, tuple(sorted(download_params.items())))
+    
     with download_col2:
         if st.button("Download Data", use_container_width=True, type="primary"):
             with st.spinner("Preparing your download..."):
                 try:
-                    # Build download parameters
-                    download_params = st.session_state.get('preview_params', {})
-                    download_params['format'] = export_format.lower()
-                    
                     # Generate filename
                     if custom_filename:
                         filename_base = custom_filename
                     else:
-                        from datetime import datetime
                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                         filename_base = f"{data_type.lower().replace(' ', '_')}_{timestamp}"
                     
                     # Make download API call
-                    if data_type == "Expenses Only":
-                        download_url = f"{API_BASE_URL}/export/expenses"
-                    elif data_type == "Budgets Only":
-                        download_url = f"{API_BASE_URL}/export/budgets"
-                    else:
-                        download_url = f"{API_BASE_URL}/export/combined"
+                    try:
+                        data_bytes = fetch_export_bytes(*export_key)
+                    except requests.HTTPError as e:
+                        data_bytes = None
+                        st.error(f"Download failed: {e.response.status_code}")
+                        if e.response.text:
+                            st.error(f"Error details: {e.response.text}")
                     
-                    download_response = requests.get(download_url, params=download_params)
-                    
-                    if download_response.status_code == 200:
+                    if data_bytes is not None:
                         # Set MIME type based on format
                         if export_format == "CSV":
                             mime_type = "text/csv"
@@ -1505,19 +1488,8 @@ def show_download_data_page():
                             mime_type = "application/json"
                             file_ext = ".json"
                         
-                        # Provide download
-                        st.download_button(
-                            label=f"Click to Download {export_format} File",
-                            data=download_response.content,
-                            file_name=f"{filename_base}{file_ext}",
-                            mime=mime_type,
-                            use_container_width=True
-                        )
-                        
-                        st.success(f"{export_format} file prepared successfully!")
-                        
                         # Show download info
-                        file_size = len(download_response.content)
+                        file_size = len(data_bytes)
                         if file_size > 1024*1024:
                             size_str = f"{file_size/(1024*1024):.1f} MB"
                         elif file_size > 1024:
@@ -1525,35 +1497,87 @@ def show_download_data_page():
                         else:
                             size_str = f"{file_size} bytes"
                         
-                        st.info(f"File size: {size_str}")
-                        
-                    else:
-                        st.error(f"Download failed: {download_response.status_code}")
-                        if download_response.text:
-                            st.error(f"Error details: {download_response.text}")
+                        st.session_state.last_export = {
+                            "key": export_key,
+                            "bytes": data_bytes,
+                            "size_str": size_str,
+                            "filename": f"{filename_base}{file_ext}",
+                            "mime": mime_type
+                        }
+                        st.success(f"{export_format} file prepared successfully!")
                         
                 except Exception as e:
                     st.error(f"Download error: {str(e)}")
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Tips section
-    st.markdown('''
-    <div class="section-container">
-        <div class="section-header">
-            <span class="icon">TIP</span>Download Tips
-        </div>
-        <div class="alert-box alert-low">
-            <strong>Pro Tips:</strong><br>
-            • Use <strong>CSV</strong> for universal compatibility with Excel, Google Sheets<br>
-            • Use <strong>Excel</strong> for formatted reports with multiple sheets (Combined Report)<br>
-            • Use <strong>JSON</strong> for API integration or custom data processing<br>
-            • Filter by currency to get region-specific reports<br>
-            • Use date ranges for quarterly or annual reports<br>
-            • Custom filenames help organize your downloads
-        </div>
-    </div>
-    ''', unsafe_allow_html=True)
+        
+        # Keep offering the prepared file on later reruns (such as the one its own click triggers) while the filters match
+        last_export = st.session_state.get('last_export')
+        if last_export and last_export['key'] == export_key:
+            st.download_button(
+                label=f"Click to Download {export_format} File",
+                data=last_export['bytes'],
+                file_name=last_export['filename'],
+                mime=last_export['mime'],
+                use_container_width=True
+            )
+            st.info(f"File size: {last_export['size_str']}")
+
+# Page key -> sidebar label
+PAGES = {
+    "Overview": "Dashboard Overview",
+    "Analytics": "Analytics & Charts",
+    "Expense Classification": "Expense Classification",
+    "Forecasting": "Budget Forecasting",
+    "Anomaly Detection": "Anomaly Alerts",
+    "Data Management": "Data Management",
+    "Download Data": "Download Data"
+}
+
+# Static sidebar markup, built once; the status block is picked by API health
+SIDEBAR_HEADER_HTML = '''
+<div style="background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%); 
+            padding: 1.5rem; margin: -1rem -1rem 2rem -1rem; border-radius: 0 0 12px 12px;">
+    <h2 style="color: white; margin: 0; text-align: center; font-size: 1.4rem;">NAVIGATION</h2>
+</div>
+'''
+
+_SIDEBAR_STATUS_HEADER = '''
+<hr>
+<div style="background: rgba(30, 41, 59, 0.8); padding: 1rem; border-radius: 8px; margin: 1rem 0; 
+            border: 1px solid rgba(59, 130, 246, 0.2); box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+    <h4 style="color: #e2e8f0; margin: 0 0 0.5rem 0;">SYSTEM STATUS</h4>
+</div>
+'''
+
+SIDEBAR_STATUS_HTML = {
+    True: _SIDEBAR_STATUS_HEADER + '''
+<div style="background: rgba(16, 185, 129, 0.1); padding: 0.75rem; border-radius: 6px; 
+            border: 1px solid #10b981; color: #6ee7b7; font-weight: 500;">
+    STATUS: API Backend Online
+</div>
+''',
+    False: _SIDEBAR_STATUS_HEADER + '''
+<div style="background: rgba(239, 68, 68, 0.1); padding: 0.75rem; border-radius: 6px; 
+            border: 1px solid #ef4444; color: #fca5a5; font-weight: 500;">
+    STATUS: API Backend Offline<br>
+    <small>Start with: py -m uvicorn src.api.main:app --reload --port 8000</small>
+</div>
+'''
+}
+
+def _follow_nav():
+    """Switch to the page picked in the sidebar radio."""
+    st.session_state.page = st.session_state.nav_page
+
+# Page key -> render function
+_PAGE_HANDLERS = {
+    "Overview": show_overview_page,
+    "Analytics": show_analytics_page,
+    "Expense Classification": show_ml_features_page,
+    "Forecasting": show_forecasting_page,
+    "Anomaly Detection": show_anomaly_detection_page,
+    "Data Management": show_data_management_page,
+    "Download Data": show_download_data_page
+}
 
 # Main App
 def main():
@@ -1563,70 +1587,29 @@ def main():
     if 'page' not in st.session_state:
         st.session_state.page = "Overview"
     
-    # Professional Sidebar navigation
-    st.sidebar.markdown('''
-    <div style="background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%); 
-                padding: 1.5rem; margin: -1rem -1rem 2rem -1rem; border-radius: 0 0 12px 12px;">
-        <h2 style="color: white; margin: 0; text-align: center; font-size: 1.4rem;">NAVIGATION</h2>
-    </div>
-    ''', unsafe_allow_html=True)
+    # One (cached) health probe per rerun
+    api_online = check_api_health()
     
-    pages = {
-        "Overview": "Dashboard Overview",
-        "Analytics": "Analytics & Charts", 
-        "Expense Classification": "Expense Classification",
-        "Forecasting": "Budget Forecasting",
-        "Anomaly Detection": "Anomaly Alerts",
-        "Data Management": "Data Management",
-        "Download Data": "Download Data"
-    }
+    # Keep the sidebar radio in step with page changes made elsewhere (e.g. Quick Actions)
+    if st.session_state.get("nav_page") != st.session_state.page:
+        st.session_state.nav_page = st.session_state.page
     
-    # Page selection
-    for page_key, page_name in pages.items():
-        if st.sidebar.button(page_name, use_container_width=True):
-            st.session_state.page = page_key
-            st.rerun()
+    # Professional Sidebar navigation
+    st.sidebar.markdown(SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
+    st.sidebar.radio(
+        "Navigation",
+        list(PAGES),
+        format_func=PAGES.get,
+        key="nav_page",
+        on_change=_follow_nav,
+        label_visibility="collapsed"
+    )
     
     # API Status in sidebar
-    st.sidebar.markdown("---")
-    st.sidebar.markdown('''
-    <div style="background: rgba(30, 41, 59, 0.8); padding: 1rem; border-radius: 8px; margin: 1rem 0; 
-                border: 1px solid rgba(59, 130, 246, 0.2); box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-        <h4 style="color: #e2e8f0; margin: 0 0 0.5rem 0;">SYSTEM STATUS</h4>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    if check_api_health():
-        st.sidebar.markdown('''
-        <div style="background: rgba(16, 185, 129, 0.1); padding: 0.75rem; border-radius: 6px; 
-                    border: 1px solid #10b981; color: #6ee7b7; font-weight: 500;">
-            STATUS: API Backend Online
-        </div>
-        ''', unsafe_allow_html=True)
-    else:
-        st.sidebar.markdown('''
-        <div style="background: rgba(239, 68, 68, 0.1); padding: 0.75rem; border-radius: 6px; 
-                    border: 1px solid #ef4444; color: #fca5a5; font-weight: 500;">
-            STATUS: API Backend Offline<br>
-            <small>Start with: py -m uvicorn src.api.main:app --reload --port 8000</small>
-        </div>
-        ''', unsafe_allow_html=True)
+    st.sidebar.markdown(SIDEBAR_STATUS_HTML[api_online], unsafe_allow_html=True)
     
     # Display selected page
-    if st.session_state.page == "Overview":
-        show_overview_page()
-    elif st.session_state.page == "Analytics":
-        show_analytics_page()
-    elif st.session_state.page == "Expense Classification":
-        show_ml_features_page()
-    elif st.session_state.page == "Forecasting":
-        show_forecasting_page()
-    elif st.session_state.page == "Anomaly Detection":
-        show_anomaly_detection_page()
-    elif st.session_state.page == "Data Management":
-        show_data_management_page()
-    elif st.session_state.page == "Download Data":
-        show_download_data_page()
+    _PAGE_HANDLERS.get(st.session_state.page, show_overview_page)()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
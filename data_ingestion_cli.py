@@ -5,6 +5,11 @@ import sys
 import os
 import argparse
 import csv
+import gzip
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from datetime import datetime, date
 import re
@@ -19,10 +24,36 @@ except ImportError:
     PANDAS_AVAILABLE = False
     print("⚠️  Warning: pandas not available. Using basic CSV processing.")
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Columns every expenses CSV must have
+REQUIRED_COLUMNS = ['date', 'amount', 'vendor', 'department']
+
+# Accepted input date formats, tried in order
+DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']
+
+# Currency symbols, thousands separators and whitespace stripped from amounts
+AMOUNT_STRIP = re.compile(r'[$,\s]')
+
+# Columns of the processed expenses file
+OUTPUT_COLUMNS = ('date', 'amount', 'vendor', 'description', 'department', 'category', 'created_at')
+
+# Keep only the first this many error/warning messages in memory (all are still counted)
+MAX_MESSAGES = 1000
+
+
+# Below this many rows, parallel processing falls back to a single process
+PARALLEL_MIN_ROWS = 10000
+
 class SimpleDataProcessor:
     """Simple data processor using only built-in libraries."""
     
-    def __init__(self):
+    def __init__(self, gzip_output=False):
+        self.gzip_output = gzip_output  # Write processed_<name>.gz instead of plain CSV
         self.errors = []
         self.warnings = []
         
@@ -61,55 +92,114 @@ class SimpleDataProcessor:
             'hp': 'Equipment'
         }
         
+        # Description keywords, checked in order after the vendor mappings
+        self.description_keywords = [
+            (['cloud', 'software', 'api'], 'IT Infrastructure'),
+            (['marketing', 'ad', 'campaign'], 'Marketing'),
+            (['travel', 'trip', 'hotel'], 'Travel'),
+            (['office', 'supplies'], 'Office Supplies'),
+            (['payroll', 'recruitment'], 'Personnel'),
+            (['utility', 'electric', 'internet'], 'Utilities'),
+            (['legal', 'consulting'], 'Professional Services'),
+            (['training', 'course'], 'Training'),
+            (['computer', 'equipment'], 'Equipment')
+        ]
+        
+        # Single automaton over all keywords; a lower rank wins within each kind
+        self.keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            rank = 0
+            for keyword, category in self.vendor_category_map.items():
+                automaton.add_word(keyword, (rank, category, True))
+                rank += 1
+            for words, category in self.description_keywords:
+                for word in words:
+                    automaton.add_word(word, (rank, category, False))
+                rank += 1
+            automaton.make_automaton()
+            self.keyword_automaton = automaton
+        
         self.departments = ['Engineering', 'Marketing', 'Sales', 'HR', 'Finance', 'Operations', 'Executive']
         self.categories = [
             'IT Infrastructure', 'Marketing', 'Travel', 'Office Supplies', 
             'Personnel', 'Utilities', 'Professional Services', 'Training', 
             'Equipment', 'Other'
         ]
+        
+        # Lowercase lookups built once; partial matches are substring keys checked in order
+        self.department_lookup = {dept.lower(): dept for dept in self.departments}
+        self.category_lookup = {cat.lower(): cat for cat in self.categories}
+        self.department_partials = {
+            'eng': 'Engineering', 'market': 'Marketing', 'sale': 'Sales',
+            'hr': 'HR', 'human': 'HR', 'finance': 'Finance', 'fin': 'Finance',
+            'ops': 'Operations', 'operation': 'Operations', 'exec': 'Executive'
+        }
+        self.category_partials = {
+            'it': 'IT Infrastructure', 'tech': 'IT Infrastructure',
+            'marketing': 'Marketing', 'travel': 'Travel',
+            'office': 'Office Supplies', 'supplies': 'Office Supplies',
+            'personnel': 'Personnel', 'payroll': 'Personnel',
+            'utility': 'Utilities', 'professional': 'Professional Services',
+            'legal': 'Professional Services', 'training': 'Training',
+            'equipment': 'Equipment', 'hardware': 'Equipment'
+        }
+        
+        # Vendors repeat heavily (hundreds of AWS rows), so their lookup is memoized per processor
+        self._vendor_category = lru_cache(maxsize=1024)(self._match_vendor)
 
     def auto_categorize_expense(self, vendor, description=""):
         """Auto-categorize expense based on vendor and description."""
-        vendor_lower = vendor.lower()
-        description_lower = description.lower()
+        category = self._vendor_category(vendor.lower())
+        if category:
+            return category
+        return self._match_description(description.lower())
+
+    def _match_vendor(self, vendor_lower):
+        """Return the category of the first vendor keyword in vendor_lower, or None."""
+        if self.keyword_automaton is not None:
+            return self._scan_keywords(vendor_lower, vendor_keywords=True)
         
-        # Check vendor mappings
         for keyword, category in self.vendor_category_map.items():
             if keyword in vendor_lower:
                 return category
+        return None
+
+    def _match_description(self, description_lower):
+        """Return the category of the first description keyword group matched, or 'Other'."""
+        if self.keyword_automaton is not None:
+            return self._scan_keywords(description_lower, vendor_keywords=False) or 'Other'
         
-        # Check description keywords
-        if any(word in description_lower for word in ['cloud', 'software', 'api']):
-            return 'IT Infrastructure'
-        elif any(word in description_lower for word in ['marketing', 'ad', 'campaign']):
-            return 'Marketing'
-        elif any(word in description_lower for word in ['travel', 'trip', 'hotel']):
-            return 'Travel'
-        elif any(word in description_lower for word in ['office', 'supplies']):
-            return 'Office Supplies'
-        elif any(word in description_lower for word in ['payroll', 'recruitment']):
-            return 'Personnel'
-        elif any(word in description_lower for word in ['utility', 'electric', 'internet']):
-            return 'Utilities'
-        elif any(word in description_lower for word in ['legal', 'consulting']):
-            return 'Professional Services'
-        elif any(word in description_lower for word in ['training', 'course']):
-            return 'Training'
-        elif any(word in description_lower for word in ['computer', 'equipment']):
-            return 'Equipment'
-        
+        for words, category in self.description_keywords:
+            if any(word in description_lower for word in words):
+                return category
         return 'Other'
 
+    def _scan_keywords(self, text, vendor_keywords):
+        """One automaton pass over text; the lowest-ranked keyword of the requested kind wins."""
+        best = None
+        for _, (rank, category, is_vendor) in self.keyword_automaton.iter(text):
+            if is_vendor == vendor_keywords and (best is None or rank < best[0]):
+                best = (rank, category)
+        return best[1] if best else None
+
     def validate_date(self, date_str):
         """Validate and parse date string."""
         if not date_str:
             return False, None
         
-        date_formats = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']
+        date_str = date_str if isinstance(date_str, str) else str(date_str)
+        
+        # ISO dates (the first format tried) parse without the strptime trial loop
+        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+            try:
+                return True, date.fromisoformat(date_str)
+            except ValueError:
+                pass
         
-        for fmt in date_formats:
+        for fmt in DATE_FORMATS:
             try:
-                parsed_date = datetime.strptime(str(date_str), fmt).date()
+                parsed_date = datetime.strptime(date_str, fmt).date()
                 return True, parsed_date
             except ValueError:
                 continue
@@ -122,7 +212,12 @@ class SimpleDataProcessor:
             return False, None
         
         try:
-            clean_amount = re.sub(r'[$,\s]', '', str(amount_str))
+            amount_str = amount_str if isinstance(amount_str, str) else str(amount_str)
+            # Plain numbers (the common case) need no cleanup
+            if amount_str.replace('.', '', 1).isdigit():
+                clean_amount = amount_str
+            else:
+                clean_amount = AMOUNT_STRIP.sub('', amount_str)
             amount = float(clean_amount)
             return amount > 0, round(amount, 2) if amount > 0 else None
         except (ValueError, TypeError):
@@ -133,22 +228,15 @@ class SimpleDataProcessor:
         if not dept_str:
             return False, None
         
-        dept = str(dept_str).strip()
+        dept = str(dept_str).strip().lower()
         
         # Exact matches
-        for department in self.departments:
-            if department.lower() == dept.lower():
-                return True, department
+        if dept in self.department_lookup:
+            return True, self.department_lookup[dept]
         
         # Partial matches
-        mappings = {
-            'eng': 'Engineering', 'market': 'Marketing', 'sale': 'Sales',
-            'hr': 'HR', 'human': 'HR', 'finance': 'Finance', 'fin': 'Finance',
-            'ops': 'Operations', 'operation': 'Operations', 'exec': 'Executive'
-        }
-        
-        for key, value in mappings.items():
-            if key in dept.lower():
+        for key, value in self.department_partials.items():
+            if key in dept:
                 return True, value
         
         return False, None
@@ -158,126 +246,233 @@ class SimpleDataProcessor:
         if not cat_str:
             return False, None
         
-        category = str(cat_str).strip()
+        category = str(cat_str).strip().lower()
         
         # Exact matches
-        for cat in self.categories:
-            if cat.lower() == category.lower():
-                return True, cat
+        if category in self.category_lookup:
+            return True, self.category_lookup[category]
         
         # Partial matches
-        mappings = {
-            'it': 'IT Infrastructure', 'tech': 'IT Infrastructure',
-            'marketing': 'Marketing', 'travel': 'Travel',
-            'office': 'Office Supplies', 'supplies': 'Office Supplies',
-            'personnel': 'Personnel', 'payroll': 'Personnel',
-            'utility': 'Utilities', 'professional': 'Professional Services',
-            'legal': 'Professional Services', 'training': 'Training',
-            'equipment': 'Equipment', 'hardware': 'Equipment'
-        }
-        
-        for key, value in mappings.items():
-            if key in category.lower():
+        for key, value in self.category_partials.items():
+            if key in category:
                 return True, value
         
         return False, None
 
     def process_expenses_csv(self, file_path):
-        """Process expenses CSV file."""
-        self.errors = []
-        self.warnings = []
-        valid_records = []
+        """Process expenses CSV file, vectorized with pandas when it is installed."""
+        if PANDAS_AVAILABLE:
+            return self._process_with_pandas(file_path)
+        return self._process_rows(file_path)
+
+    def _output_path(self, file_path):
+        """Return the processed output path and whether it is gzip-compressed."""
+        source = Path(file_path)
+        output_file = source.parent / f"processed_{source.name}"
+        if self.gzip_output:
+            output_file = output_file.with_name(output_file.name + '.gz')
+        return output_file, self.gzip_output
+
+    def _process_with_pandas(self, file_path):
+        """Validate the whole file column-wise with pandas."""
+        self._reset_messages()
+        
+        try:
+            df = pd.read_csv(file_path, dtype=str, keep_default_na=False, encoding='utf-8')
+            
+            missing = self._missing_columns_result(df.columns)
+            if missing:
+                return missing
+            
+            # Short rows come back as NaN; treat them as empty cells
+            df = df.fillna('')
+            raw_date, raw_amount, raw_dept = df['date'], df['amount'], df['department']
+            
+            # Dates: first format that parses wins, as in validate_date
+            dates = pd.to_datetime(raw_date, format=DATE_FORMATS[0], errors='coerce')
+            for fmt in DATE_FORMATS[1:]:
+                dates = dates.fillna(pd.to_datetime(raw_date, format=fmt, errors='coerce'))
+            
+            cleaned = raw_amount.str.replace(AMOUNT_STRIP, '', regex=True)
+            amounts = pd.to_numeric(cleaned, errors='coerce')
+            # float() also accepts spellings such as '1_000'; give the leftovers to validate_amount
+            retry = amounts.isna() & (cleaned != '')
+            if retry.any():
+                amounts[retry] = raw_amount[retry].map(
+                    {value: self.validate_amount(value)[1] for value in raw_amount[retry].unique()}
+                ).astype(float)
+            vendors = df['vendor'].str.strip()
+            descriptions = df['description'] if 'description' in df.columns else pd.Series('', index=df.index)
+            
+            # Departments and categories repeat heavily, so validate each distinct value once
+            departments = raw_dept.map({value: self.validate_department(value)[1] for value in raw_dept.unique()})
+            if 'category' in df.columns:
+                raw_cat = df['category']
+                categories = raw_cat.map({value: self.validate_category(value)[1] for value in raw_cat.unique()})
+                invalid_cat = (raw_cat != '') & categories.isna()
+            else:
+                raw_cat = None
+                categories = pd.Series(None, index=df.index, dtype=object)
+                invalid_cat = pd.Series(False, index=df.index)
+            
+            # Auto-categorize rows without a usable category
+            needs_auto = categories.isna() & (vendors != '')
+            if needs_auto.any():
+                pairs = list(zip(vendors[needs_auto], descriptions[needs_auto]))
+                lookup = {pair: self.auto_categorize_expense(*pair) for pair in set(pairs)}
+                categories[needs_auto] = [lookup[pair] for pair in pairs]
+            
+            bad_date = dates.isna()
+            bad_amount = ~(amounts > 0)
+            bad_vendor = vendors == ''
+            bad_dept = departments.isna()
+            invalid = bad_date | bad_amount | bad_vendor | bad_dept
+            
+            self.error_count = int(invalid.sum())
+            self.warning_count = int(invalid_cat.sum() + needs_auto.sum())
+            
+            # Only the first messages are kept, so only those rows are formatted
+            for i in df.index[invalid][:MAX_MESSAGES]:
+                row_errors = []
+                if bad_date[i]:
+                    row_errors.append(f"Invalid date: {raw_date[i]}")
+                if bad_amount[i]:
+                    row_errors.append(f"Invalid amount: {raw_amount[i]}")
+                if bad_vendor[i]:
+                    row_errors.append("Vendor is required")
+                if bad_dept[i]:
+                    row_errors.append(f"Invalid department: {raw_dept[i]}")
+                self.errors.append(f"Row {i + 2}: {'; '.join(row_errors)}")
+            
+            for i in df.index[invalid_cat | needs_auto]:
+                if len(self.warnings) >= MAX_MESSAGES:
+                    break
+                if invalid_cat[i]:
+                    self.warnings.append(f"Row {i + 2}: Invalid category '{raw_cat[i]}', will auto-categorize")
+                if needs_auto[i] and len(self.warnings) < MAX_MESSAGES:
+                    self.warnings.append(f"Row {i + 2}: Auto-categorized as '{categories[i]}'")
+            
+            valid = ~invalid
+            records_processed = int(valid.sum())
+            
+            # Save processed data
+            if records_processed:
+                output = pd.DataFrame({
+                    'date': dates[valid].dt.strftime('%Y-%m-%d'),
+                    # Python's round() rather than Series.round() so halves round exactly as before
+                    'amount': amounts[valid].map({amount: round(float(amount), 2) for amount in amounts[valid].unique()}),
+                    'vendor': vendors[valid],
+                    'description': descriptions[valid].str.strip(),
+                    'department': departments[valid],
+                    'category': categories[valid],
+                    'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }, columns=list(OUTPUT_COLUMNS))
+                output_file, compress = self._output_path(file_path)
+                output.to_csv(output_file, index=False, compression='gzip' if compress else None)
+                print(f"✅ Processed data saved to: {output_file}")
+            
+            return self._summary(records_processed)
         
-        required_columns = ['date', 'amount', 'vendor', 'department']
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f"Error processing file: {str(e)}",
+                'records_processed': 0,
+                'errors': [str(e)]
+            }
+
+    def _process_rows(self, file_path):
+        """Process expenses CSV file, streaming validated rows straight to the output file."""
+        self._reset_messages()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
                 
-                # Check required columns
-                missing_cols = [col for col in required_columns if col not in reader.fieldnames]
-                if missing_cols:
-                    return {
-                        'success': False,
-                        'message': f"Missing required columns: {missing_cols}",
-                        'records_processed': 0,
-                        'errors': [f"Missing columns: {', '.join(missing_cols)}"]
-                    }
+                missing = self._missing_columns_result(header)
+                if missing:
+                    return missing
                 
-                for row_num, row in enumerate(reader, start=2):
-                    row_errors = []
-                    
-                    # Validate required fields
-                    date_valid, expense_date = self.validate_date(row['date'])
-                    if not date_valid:
-                        row_errors.append(f"Invalid date: {row['date']}")
-                    
-                    amount_valid, amount = self.validate_amount(row['amount'])
-                    if not amount_valid:
-                        row_errors.append(f"Invalid amount: {row['amount']}")
-                    
-                    vendor = row['vendor'].strip() if row['vendor'] else ""
-                    if not vendor:
-                        row_errors.append("Vendor is required")
-                    
-                    dept_valid, department = self.validate_department(row['department'])
-                    if not dept_valid:
-                        row_errors.append(f"Invalid department: {row['department']}")
-                    
-                    # Handle category (auto-categorize if missing/invalid)
-                    category = None
-                    if 'category' in row and row['category']:
-                        cat_valid, category = self.validate_category(row['category'])
-                        if not cat_valid:
-                            self.warnings.append(f"Row {row_num}: Invalid category '{row['category']}', will auto-categorize")
-                            category = None
-                    
-                    if not category and vendor:
-                        category = self.auto_categorize_expense(vendor, row.get('description', ''))
-                        self.warnings.append(f"Row {row_num}: Auto-categorized as '{category}'")
-                    
-                    if row_errors:
-                        self.errors.append(f"Row {row_num}: {'; '.join(row_errors)}")
-                        continue
-                    
-                    # Create valid record
-                    record = {
-                        'date': expense_date.strftime('%Y-%m-%d'),
-                        'amount': amount,
-                        'vendor': vendor,
-                        'description': row.get('description', '').strip(),
-                        'department': department,
-                        'category': category,
-                        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
+                # Written gzip-compressed when --gzip is given
+                output_file, compress = self._output_path(file_path)
+                opener = gzip.open if compress else open
+                
+                with opener(output_file, 'wt', newline='', encoding='utf-8') as out:
+                    writer = csv.writer(out)
+                    writer.writerow(OUTPUT_COLUMNS)
                     
-                    valid_records.append(record)
+                    # Blank lines are skipped without counting, as csv.DictReader does
+                    writer.writerows(self._iter_valid_rows((row for row in reader if row), header))
+                    records_processed = self.valid_count
             
-            # Save processed records to a new CSV file
-            if valid_records:
-                output_file = Path(file_path).parent / f"processed_{Path(file_path).name}"
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    fieldnames = ['date', 'amount', 'vendor', 'description', 'department', 'category', 'created_at']
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(valid_records)
-                
+            # Only keep the processed file if something was written to it
+            if records_processed:
                 print(f"✅ Processed data saved to: {output_file}")
+            else:
+                output_file.unlink()
             
-            success = len(self.errors) == 0
-            message = f"Successfully processed {len(valid_records)} records"
-            if self.errors:
-                message += f" with {len(self.errors)} errors"
-            if self.warnings:
-                message += f" and {len(self.warnings)} warnings"
-            
+            return self._summary(records_processed)
+        
+        except Exception as e:
             return {
-                'success': success,
-                'message': message,
-                'records_processed': len(valid_records),
-                'errors': self.errors[:10],
-                'warnings': self.warnings[:10]
+                'success': False,
+                'message': f"Error processing file: {str(e)}",
+                'records_processed': 0,
+                'errors': [str(e)]
             }
+
+    def process_expenses_csv_parallel(self, file_path, workers=None):
+        """Process a large expenses CSV by validating chunks of rows in worker processes."""
+        self._reset_messages()
+        records_processed = 0
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                
+                missing = self._missing_columns_result(header)
+                if missing:
+                    return missing
+                
+                rows = [row for row in reader if row]
+            
+            # Process startup costs more than it saves on small files
+            workers = workers or os.cpu_count() or 1
+            if workers < 2 or len(rows) < PARALLEL_MIN_ROWS:
+                return self.process_expenses_csv(file_path)
+            
+            chunk_size = -(-len(rows) // workers)
+            chunks = [
+                (rows[start:start + chunk_size], header, start + 2)
+                for start in range(0, len(rows), chunk_size)
+            ]
+            
+            output_file, compress = self._output_path(file_path)
+            opener = gzip.open if compress else open
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor, \
+                    opener(output_file, 'wt', newline='', encoding='utf-8') as out:
+                writer = csv.writer(out)
+                writer.writerow(OUTPUT_COLUMNS)
+                
+                # map() hands back chunk results in file order
+                for records, errors, warnings, error_count, warning_count in executor.map(_validate_chunk, chunks):
+                    writer.writerows(records)
+                    records_processed += len(records)
+                    self.errors.extend(errors[:MAX_MESSAGES - len(self.errors)])
+                    self.warnings.extend(warnings[:MAX_MESSAGES - len(self.warnings)])
+                    self.error_count += error_count
+                    self.warning_count += warning_count
+            
+            # Only keep the processed file if something was written to it
+            if records_processed:
+                print(f"✅ Processed data saved to: {output_file}")
+            else:
+                output_file.unlink()
+            
+            return self._summary(records_processed)
         
         except Exception as e:
             return {
@@ -287,6 +482,127 @@ class SimpleDataProcessor:
                 'errors': [str(e)]
             }
 
+    def _iter_valid_rows(self, rows, header, first_row_num=2):
+        """Validate raw CSV rows, yielding output tuples; counts and messages are kept on self."""
+        # Resolve column positions once instead of hashing a dict per row
+        col = {name: index for index, name in reversed(list(enumerate(header)))}
+        date_i, amount_i, vendor_i, dept_i = (col[name] for name in REQUIRED_COLUMNS)
+        desc_i = col.get('description')
+        cat_i = col.get('category')
+        width = len(header)
+        
+        # One timestamp for the whole batch instead of a clock read per row
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.valid_count = 0
+        
+        for row_num, row in enumerate(rows, start=first_row_num):
+            if len(row) < width:
+                row += [None] * (width - len(row))
+            row_errors = []
+            
+            # Validate required fields
+            date_valid, expense_date = self.validate_date(row[date_i])
+            if not date_valid:
+                row_errors.append(f"Invalid date: {row[date_i]}")
+            
+            amount_valid, amount = self.validate_amount(row[amount_i])
+            if not amount_valid:
+                row_errors.append(f"Invalid amount: {row[amount_i]}")
+            
+            vendor = row[vendor_i].strip() if row[vendor_i] else ""
+            if not vendor:
+                row_errors.append("Vendor is required")
+            
+            dept_valid, department = self.validate_department(row[dept_i])
+            if not dept_valid:
+                row_errors.append(f"Invalid department: {row[dept_i]}")
+            
+            description = (row[desc_i] or '') if desc_i is not None else ''
+            
+            # Handle category (auto-categorize if missing/invalid)
+            category = None
+            if cat_i is not None and row[cat_i]:
+                cat_valid, category = self.validate_category(row[cat_i])
+                if not cat_valid:
+                    self._add_warning(f"Row {row_num}: Invalid category '{row[cat_i]}', will auto-categorize")
+                    category = None
+            
+            if not category and vendor:
+                category = self.auto_categorize_expense(vendor, description)
+                self._add_warning(f"Row {row_num}: Auto-categorized as '{category}'")
+            
+            if row_errors:
+                self._add_error(f"Row {row_num}: {'; '.join(row_errors)}")
+                continue
+            
+            self.valid_count += 1
+            yield (
+                expense_date.strftime('%Y-%m-%d'),
+                amount,
+                vendor,
+                description.strip(),
+                department,
+                category,
+                created_at
+            )
+
+    def _reset_messages(self):
+        """Start a fresh error/warning log for one file."""
+        self.errors = deque(maxlen=MAX_MESSAGES)
+        self.warnings = deque(maxlen=MAX_MESSAGES)
+        self.error_count = 0
+        self.warning_count = 0
+
+    def _add_error(self, message):
+        """Count an error, keeping the text of the first MAX_MESSAGES only."""
+        if self.error_count < MAX_MESSAGES:
+            self.errors.append(message)
+        self.error_count += 1
+
+    def _add_warning(self, message):
+        """Count a warning, keeping the text of the first MAX_MESSAGES only."""
+        if self.warning_count < MAX_MESSAGES:
+            self.warnings.append(message)
+        self.warning_count += 1
+
+    @staticmethod
+    def _missing_columns_result(columns):
+        """Return the failure result when a required column is missing, else None."""
+        missing_cols = [col for col in REQUIRED_COLUMNS if col not in columns]
+        if not missing_cols:
+            return None
+        return {
+            'success': False,
+            'message': f"Missing required columns: {missing_cols}",
+            'records_processed': 0,
+            'errors': [f"Missing columns: {', '.join(missing_cols)}"]
+        }
+
+    def _summary(self, records_processed):
+        """Build the result dict from this run's counts and first messages."""
+        message = f"Successfully processed {records_processed} records"
+        if self.error_count:
+            message += f" with {self.error_count} errors"
+        if self.warning_count:
+            message += f" and {self.warning_count} warnings"
+        
+        return {
+            'success': self.error_count == 0,
+            'message': message,
+            'records_processed': records_processed,
+            'errors': list(islice(self.errors, 10)),
+            'warnings': list(islice(self.warnings, 10))
+        }
+
+
+def _validate_chunk(args):
+    """Worker entry point: validate one chunk of rows with a fresh processor."""
+    rows, header, first_row_num = args
+    processor = SimpleDataProcessor()
+    processor._reset_messages()
+    records = list(processor._iter_valid_rows(rows, header, first_row_num))
+    return records, list(processor.errors), list(processor.warnings), processor.error_count, processor.warning_count
+
 def main():
     """Main CLI function."""
     parser = argparse.ArgumentParser(
@@ -299,6 +615,10 @@ def main():
     # Upload expenses command
     upload_parser = subparsers.add_parser('upload-expenses', help='Upload expenses from CSV')
     upload_parser.add_argument('file_path', help='Path to CSV file')
+    upload_parser.add_argument('--workers', type=int, default=1,
+                               help='Validate large files in this many processes')
+    upload_parser.add_argument('--gzip', action='store_true',
+                               help='Write the processed file gzip-compressed as processed_<name>.gz')
     
     # Templates command
     subparsers.add_parser('templates', help='Show CSV template formats')
@@ -312,7 +632,7 @@ def main():
         parser.print_help()
         return
     
-    processor = SimpleDataProcessor()
+    processor = SimpleDataProcessor(gzip_output=getattr(args, 'gzip', False))
     
     if args.command == 'upload-expenses':
         file_path = Path(args.file_path)
@@ -324,7 +644,10 @@ def main():
         print(f"📁 Processing expense file: {args.file_path}")
         print("=" * 50)
         
-        result = processor.process_expenses_csv(file_path)
+        if args.workers > 1:
+            result = processor.process_expenses_csv_parallel(file_path, args.workers)
+        else:
+            result = processor.process_expenses_csv(file_path)
         
         if result['success']:
             print(f"✅ {result['message']}")
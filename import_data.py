@@ -7,6 +7,9 @@ sys.path.append('src')
 from services.data_processor import DataProcessor
 from database import init_db
 
+# Number of expenses inserted per transaction
+BATCH_SIZE = 1000
+
 def import_expenses():
     """Import expenses from CSV to database."""
     print("🚀 Starting data import...")
@@ -26,30 +29,33 @@ def import_expenses():
     # Initialize data processor
     processor = DataProcessor()
     
-    # Import each expense
-    imported_count = 0
-    for _, row in df.iterrows():
+    # Build expense records straight from the columns (iterrows builds a Series per row)
+    descriptions = df['description'].fillna('') if 'description' in df.columns else [''] * len(df)
+    categories = df['category'] if 'category' in df.columns else ['Other'] * len(df)
+    
+    expenses = []
+    for date, amount, vendor, description, department, category in zip(
+            df['date'], df['amount'], df['vendor'], descriptions, df['department'], categories):
         try:
-            # Pass arguments individually as required by the method signature
-            result = processor.add_expense(
-                date=row['date'],
-                amount=float(row['amount']),
-                vendor=row['vendor'],
-                description=row.get('description', ''),
-                department=row['department'],
-                category=row.get('category', 'Other')
-            )
-            
-            if 'error' not in result:
-                imported_count += 1
-            
-            if imported_count % 100 == 0:
-                print(f"   Imported {imported_count} expenses...")
-                
+            expenses.append({
+                'date': date,
+                'amount': float(amount),
+                'vendor': vendor,
+                'description': description,
+                'department': department,
+                'category': category
+            })
         except Exception as e:
-            print(f"⚠️  Error importing expense {row.get('vendor', 'Unknown')}: {e}")
+            print(f"⚠️  Error importing expense {vendor}: {e}")
             continue
     
+    # Insert in batches, one transaction per batch instead of one per expense
+    imported_count = 0
+    for start in range(0, len(expenses), BATCH_SIZE):
+        results = processor.add_expenses_bulk(expenses[start:start + BATCH_SIZE])
+        imported_count += sum(1 for result in results if result['success'])
+        print(f"   Imported {imported_count} expenses...")
+    
     print(f"✅ Successfully imported {imported_count} expenses!")
     
     # Verify import
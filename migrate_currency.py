@@ -7,6 +7,49 @@ import sqlite3
 import sys
 from pathlib import Path
 
+# Columns of the unique budget key; allocated_amount is compared in whole cents
+BUDGET_KEY_COLUMNS = ('department', 'category', 'period_start', 'period_end', 'currency')
+
+def _cents(amount):
+    """Whole cents of an amount, as the API rounds allocated_amount on insert."""
+    return int(round(float(amount) * 100))
+
+def migrate_budget_uniqueness(cursor):
+    """Add the uq_budget_currency index, refusing while stored budgets collide under its key."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'uq_budget_currency'")
+    if cursor.fetchone():
+        print("✅ Unique budget index already exists")
+        return True
+    
+    print("💼 Checking budgets for duplicates before adding the unique index...")
+    cursor.execute(f"SELECT id, {', '.join(BUDGET_KEY_COLUMNS)}, allocated_amount FROM budgets ORDER BY id")
+    groups = {}
+    for budget_id, *key, amount in cursor.fetchall():
+        groups.setdefault((*key, _cents(amount)), []).append(budget_id)
+    
+    collisions = [(key, ids) for key, ids in groups.items() if len(ids) > 1]
+    if collisions:
+        print(f"❌ {len(collisions)} budget keys are stored more than once; resolve them and re-run:")
+        for (department, category, start, end, currency, cents), ids in collisions:
+            print(f"   • {department} / {category} {start}..{end} {currency} {cents / 100:,.2f}: ids {ids}")
+        print("⚠️  Unique budget index not created")
+        return False
+    
+    # Store amounts at the cent precision the index compares on
+    cursor.execute("SELECT id, allocated_amount FROM budgets")
+    updates = [
+        (_cents(amount) / 100, budget_id)
+        for budget_id, amount in cursor.fetchall() if amount != _cents(amount) / 100
+    ]
+    cursor.executemany("UPDATE budgets SET allocated_amount = ? WHERE id = ?", updates)
+    
+    cursor.execute(
+        "CREATE UNIQUE INDEX uq_budget_currency ON budgets "
+        f"({', '.join(BUDGET_KEY_COLUMNS)}, allocated_amount)"
+    )
+    print(f"✅ Created unique budget index ({len(updates)} amounts rounded to cents)")
+    return True
+
 def migrate_database():
     """Add currency columns to existing tables."""
     
@@ -21,20 +64,25 @@ def migrate_database():
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        print("🚀 Starting database migration for multi-currency support...")
+        # Connection-level tuning for the duration of the migration
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
         
-        # Check if columns already exist
-        cursor.execute("PRAGMA table_info(expenses)")
-        expense_columns = [col[1] for col in cursor.fetchall()]
+        print("🚀 Starting database migration for multi-currency support...")
         
-        cursor.execute("PRAGMA table_info(budgets)")
-        budget_columns = [col[1] for col in cursor.fetchall()]
+        # Run every schema change in one transaction (sqlite3 would autocommit each DDL statement)
+        cursor.execute("BEGIN IMMEDIATE")
         
-        cursor.execute("PRAGMA table_info(anomalies)")
-        anomaly_columns = [col[1] for col in cursor.fetchall()]
+        # Check which tables already have the column, in one metadata query
+        cursor.execute("""
+            SELECT m.name FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS c
+            WHERE m.type = 'table' AND m.name IN ('expenses', 'budgets', 'anomalies') AND c.name = 'currency'
+        """)
+        has_currency = {row[0] for row in cursor.fetchall()}
         
         # Add currency column to expenses table if not exists
-        if 'currency' not in expense_columns:
+        if 'expenses' not in has_currency:
             print("📊 Adding currency column to expenses table...")
             cursor.execute("ALTER TABLE expenses ADD COLUMN currency TEXT DEFAULT 'USD'")
             print("✅ Added currency column to expenses table")
@@ -42,7 +90,7 @@ def migrate_database():
             print("✅ Currency column already exists in expenses table")
         
         # Add currency column to budgets table if not exists
-        if 'currency' not in budget_columns:
+        if 'budgets' not in has_currency:
             print("💼 Adding currency column to budgets table...")
             cursor.execute("ALTER TABLE budgets ADD COLUMN currency TEXT DEFAULT 'USD'")
             print("✅ Added currency column to budgets table")
@@ -50,7 +98,7 @@ def migrate_database():
             print("✅ Currency column already exists in budgets table")
         
         # Add currency column to anomalies table if not exists
-        if 'currency' not in anomaly_columns:
+        if 'anomalies' not in has_currency:
             print("🚨 Adding currency column to anomalies table...")
             cursor.execute("ALTER TABLE anomalies ADD COLUMN currency TEXT DEFAULT 'USD'")
             print("✅ Added currency column to anomalies table")
@@ -68,8 +116,13 @@ def migrate_database():
         except Exception as e:
             print(f"⚠️  Warning: Could not create indexes: {e}")
         
+        budgets_unique = migrate_budget_uniqueness(cursor)
+        
         # Commit changes
         conn.commit()
+        if not budgets_unique:
+            print("\n⚠️  Currency columns migrated, but duplicate budgets block the unique index")
+            return False
         print("\n🎉 Database migration completed successfully!")
         print("\n📖 Currency Support Added:")
         print("   • USD - US Dollar")
@@ -84,6 +137,8 @@ def migrate_database():
         return True
         
     except Exception as e:
+        if 'conn' in locals() and conn.in_transaction:
+            conn.rollback()
         print(f"❌ Migration failed: {e}")
         return False
         
@@ -4,90 +4,99 @@ Script to prepare the Nsight AI Budgeting System for Git repository upload.
 This script cleans up files and ensures the project is ready for GitHub.
 """
 
+import fnmatch
 import os
+import re
 import shutil
 from pathlib import Path
 
+# Files and directories removed from the project root
+ROOT_CLEANUP_NAMES = frozenset({
+    # Database files (will be regenerated)
+    "budgeting_system.db",
+    "budgeting_system.db-journal",
+    
+    # Python cache
+    ".Python",
+    
+    # Environment files
+    ".env",
+    ".venv",
+    "venv",
+    "env",
+    
+    # IDE files
+    ".vscode",
+    ".idea",
+    
+    # OS files
+    ".DS_Store",
+    "Thumbs.db",
+    
+    # Temporary files
+    "temp",
+    "tmp",
+})
+
+# Root-level files removed by wildcard (compiled Python, editor swap files, logs)
+ROOT_CLEANUP_PATTERNS = ("*.pyc", "*.pyo", "*.pyd", "*.swp", "*.swo", "*.log")
+
+# All wildcard patterns compiled once into a single matcher
+_ROOT_CLEANUP_MATCH = re.compile("|".join(fnmatch.translate(pattern) for pattern in ROOT_CLEANUP_PATTERNS)).match
+
+# Cache directories removed at any depth
+CACHE_DIR_NAME = "__pycache__"
+
+# Directories never descended into: VCS metadata and third-party trees
+SKIP_DIR_NAMES = frozenset({".git", ".hg", ".svn", ".venv", "venv", "node_modules"})
+
+def _is_cleanup_target(entry, depth):
+    """Decide whether a directory entry found at the given depth should be removed."""
+    if entry.name == CACHE_DIR_NAME:
+        return entry.is_dir(follow_symlinks=False)
+    if depth:
+        return False
+    return entry.name in ROOT_CLEANUP_NAMES or (
+        _ROOT_CLEANUP_MATCH(entry.name) and entry.is_file()
+    )
+
+def _is_pruned(entry, depth):
+    """Decide whether the walk should stay out of a directory entry."""
+    return entry.name in SKIP_DIR_NAMES or _is_cleanup_target(entry, depth)
+
+def _iter_tree(root, prune, depth=0):
+    """Yield (DirEntry, depth) below root in one scandir pass, skipping symlinks and pruned directories."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            yield entry, depth
+            if entry.is_dir(follow_symlinks=False) and not prune(entry, depth):
+                yield from _iter_tree(entry.path, prune, depth + 1)
+
 def clean_project():
     """Clean up files that shouldn't be in the Git repository."""
     print("🧹 Cleaning project for Git repository...")
     
-    # Files and directories to remove
-    cleanup_items = [
-        # Database files (will be regenerated)
-        "budgeting_system.db",
-        "budgeting_system.db-journal",
-        
-        # Python cache
-        "__pycache__",
-        "*.pyc",
-        "*.pyo",
-        "*.pyd",
-        ".Python",
-        
-        # Environment files
-        ".env",
-        ".venv",
-        "venv",
-        "env",
-        
-        # IDE files
-        ".vscode",
-        ".idea",
-        "*.swp",
-        "*.swo",
-        
-        # OS files
-        ".DS_Store",
-        "Thumbs.db",
-        
-        # Logs
-        "*.log",
-        
-        # Temporary files
-        "temp",
-        "tmp",
+    # One traversal finds everything; matched and skipped directories are not entered
+    targets = [
+        (entry, depth) for entry, depth in _iter_tree(".", _is_pruned)
+        if _is_cleanup_target(entry, depth)
     ]
     
     removed_count = 0
     
-    for item in cleanup_items:
-        # Handle wildcards
-        if "*" in item:
-            import glob
-            for file_path in glob.glob(item, recursive=True):
-                try:
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
-                        print(f"   Removed file: {file_path}")
-                        removed_count += 1
-                except Exception as e:
-                    print(f"   Warning: Could not remove {file_path}: {e}")
-        else:
-            # Handle specific files/directories
-            if os.path.exists(item):
-                try:
-                    if os.path.isfile(item):
-                        os.remove(item)
-                        print(f"   Removed file: {item}")
-                    elif os.path.isdir(item):
-                        shutil.rmtree(item)
-                        print(f"   Removed directory: {item}")
-                    removed_count += 1
-                except Exception as e:
-                    print(f"   Warning: Could not remove {item}: {e}")
-    
-    # Clean __pycache__ directories recursively
-    for root, dirs, files in os.walk("."):
-        for dir_name in dirs:
-            if dir_name == "__pycache__":
-                cache_path = os.path.join(root, dir_name)
-                try:
-                    shutil.rmtree(cache_path)
-                    print(f"   Removed cache: {cache_path}")
-                    removed_count += 1
-                except Exception as e:
-                    print(f"   Warning: Could not remove {cache_path}: {e}")
+    for entry, depth in targets:
+        path = entry.name if depth == 0 else entry.path
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+                label = "cache" if entry.name == CACHE_DIR_NAME else "directory"
+            else:
+                os.unlink(entry.path)
+                label = "file"
+            print(f"   Removed {label}: {path}")
+            removed_count += 1
+        except Exception as e:
+            print(f"   Warning: Could not remove {path}: {e}")
     
     print(f"✅ Cleanup completed! Removed {removed_count} items.")
 
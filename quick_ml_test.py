@@ -37,8 +37,10 @@ def test_instant_predictions():
     print("📊 Prediction Results:")
     print("-" * 60)
     
-    for vendor, description in test_cases:
-        category, confidence = classifier.predict(vendor, description)
+    predictions = classifier.batch_predict(
+        [{'vendor': vendor, 'description': description} for vendor, description in test_cases]
+    )
+    for (vendor, _), (category, confidence) in zip(test_cases, predictions):
         confidence_pct = f"{confidence:.0%}"
         print(f"🏢 {vendor:20} → {category:18} ({confidence_pct})")
 
@@ -72,8 +74,10 @@ def test_ml_training():
                 ("Delta", "Flight booking")
             ]
             
-            for vendor, desc in test_cases:
-                category, confidence = classifier.predict(vendor, desc)
+            predictions = classifier.batch_predict(
+                [{'vendor': vendor, 'description': desc} for vendor, desc in test_cases]
+            )
+            for (vendor, _), (category, confidence) in zip(test_cases, predictions):
                 print(f"  • {vendor} → {category} ({confidence:.1%})")
             
             return True
@@ -1,16 +1,39 @@
 #!/usr/bin/env python3
-"""Simplified synthetic data generator for Nsight AI Budgeting System using only built-in libraries."""
+"""Simplified synthetic data generator for Nsight AI Budgeting System using only built-in libraries (NumPy optional)."""
 
 import random
+import argparse
 import csv
 import json
 from datetime import datetime, date, timedelta
+import heapq
+import io
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# CSV column order; generated rows are plain tuples in this order
+EXPENSE_FIELDNAMES = ("id", "date", "amount", "vendor", "description", "department", "category", "is_recurring", "created_at")
+BUDGET_FIELDNAMES = ("id", "department", "category", "period_start", "period_end", "allocated_amount", "spent_amount", "created_at")
 
 class SimpleSyntheticDataGenerator:
     """Generate realistic synthetic data using only built-in Python libraries."""
     
-    def __init__(self):
+    def __init__(self, seed=None):
+        # One seeded source drives every random draw, so a given seed reproduces the dataset
+        self.random = random.Random(seed)
+        
         # Create data directories
         os.makedirs("data", exist_ok=True)
         os.makedirs("uploads", exist_ok=True)
@@ -59,6 +82,37 @@ class SimpleSyntheticDataGenerator:
             ]
         }
         
+        # Description templates by category
+        self.descriptions_by_category = {
+            "IT Infrastructure": ["Cloud hosting costs", "Software licenses", "API usage fees"],
+            "Marketing": ["Ad campaign", "Marketing tools subscription", "Content creation"],
+            "Travel": ["Business trip", "Conference travel", "Client meeting travel"],
+            "Office Supplies": ["Office materials", "Desk supplies", "Meeting room supplies"],
+            "Personnel": ["Contractor payment", "Recruitment fees", "Employee benefits"],
+            "Utilities": ["Monthly utilities", "Internet service", "Phone service"],
+            "Professional Services": ["Legal consultation", "Accounting services", "Business consulting"],
+            "Training": ["Online course", "Professional certification", "Conference registration"],
+            "Equipment": ["Computer equipment", "Office furniture", "Software/hardware"],
+            "Other": ["Miscellaneous expense", "General business cost"]
+        }
+        
+        # Categories whose expenses can be recurring
+        self.recurring_categories = frozenset({"IT Infrastructure", "Utilities", "Personnel"})
+        
+        # Typical expense amount range by category
+        self.base_amounts = {
+            "IT Infrastructure": (200, 3000),
+            "Marketing": (500, 5000),
+            "Travel": (300, 2500),
+            "Office Supplies": (50, 800),
+            "Personnel": (3000, 15000),
+            "Utilities": (200, 1500),
+            "Professional Services": (1000, 8000),
+            "Training": (100, 2000),
+            "Equipment": (500, 5000),
+            "Other": (100, 1000)
+        }
+        
         # Department list
         self.departments = [
             "Engineering", "Marketing", "Sales", "HR", 
@@ -68,6 +122,20 @@ class SimpleSyntheticDataGenerator:
         # Categories
         self.categories = list(self.vendors_by_category.keys())
         
+        # Vendor and description choices as tuples indexed like self.categories
+        self.vendors_by_index = [tuple(self.vendors_by_category.get(cat, ["Generic Vendor"])) for cat in self.categories]
+        self.descriptions_by_index = [
+            tuple(self.descriptions_by_category.get(cat, ["Business expense"])) for cat in self.categories
+        ]
+        
+        # Per-category amount bounds, recurring flags and choice tables, indexed like self.categories
+        if NUMPY_AVAILABLE:
+            ranges = np.array([self.base_amounts.get(cat, (100, 1000)) for cat in self.categories], dtype=float)
+            self.amount_mins, self.amount_maxs = ranges[:, 0], ranges[:, 1]
+            self.recurring_mask = np.array([cat in self.recurring_categories for cat in self.categories])
+            self.vendor_table = self._choice_table(self.vendors_by_index)
+            self.description_table = self._choice_table(self.descriptions_by_index)
+        
         # Department budget allocations (monthly)
         self.department_budgets = {
             "Engineering": {
@@ -124,102 +192,120 @@ class SimpleSyntheticDataGenerator:
 
     def generate_expense_amount(self, category, is_anomaly=False):
         """Generate realistic expense amounts based on category."""
-        base_amounts = {
-            "IT Infrastructure": (200, 3000),
-            "Marketing": (500, 5000),
-            "Travel": (300, 2500),
-            "Office Supplies": (50, 800),
-            "Personnel": (3000, 15000),
-            "Utilities": (200, 1500),
-            "Professional Services": (1000, 8000),
-            "Training": (100, 2000),
-            "Equipment": (500, 5000),
-            "Other": (100, 1000)
-        }
-        
-        min_amt, max_amt = base_amounts.get(category, (100, 1000))
+        min_amt, max_amt = self.base_amounts.get(category, (100, 1000))
         
         if is_anomaly:
             # Create anomalies that are 2-5x normal amounts
-            multiplier = random.uniform(2.0, 5.0)
-            return round(random.uniform(min_amt, max_amt) * multiplier, 2)
+            multiplier = self.random.uniform(2.0, 5.0)
+            return round(self.random.uniform(min_amt, max_amt) * multiplier, 2)
         
-        return round(random.uniform(min_amt, max_amt), 2)
+        return round(self.random.uniform(min_amt, max_amt), 2)
+
+    def _write_csv(self, csv_file, rows, header=None, mode='w'):
+        """Render rows into memory and write the CSV file in a single call."""
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(header)
+        writer.writerows(rows)
+        with open(csv_file, mode, newline='', encoding='utf-8') as file:
+            file.write(buffer.getvalue())
 
     def generate_expenses_csv(self, start_date, end_date, num_records=1500):
         """Generate synthetic expense records and save to CSV."""
         print(f"Generating {num_records} expense records from {start_date} to {end_date}...")
         
+        if NUMPY_AVAILABLE:
+            expenses = self._sample_expenses(start_date, end_date, num_records)
+        else:
+            expenses = self._generate_expense_rows(start_date, end_date, num_records)
+        
+        # Save to CSV
+        csv_file = "data/expenses.csv"
+        self._write_csv(csv_file, expenses, header=EXPENSE_FIELDNAMES)
+        
+        print(f"✅ Generated {len(expenses)} expense records saved to {csv_file}")
+        return expenses
+
+    def _sample_expenses(self, start_date, end_date, num_records):
+        """Sample every expense column in one vectorized NumPy pass."""
+        rng = np.random.default_rng(self.random.getrandbits(64))
+        n = num_records
+        
+        days = rng.integers(0, (end_date - start_date).days + 1, n)
+        dates = np.datetime_as_string(np.datetime64(start_date, 'D') + days, unit='D')
+        departments = np.array(self.departments)[rng.integers(0, len(self.departments), n)]
+        cat_idx = rng.integers(0, len(self.categories), n)
+        categories = np.array(self.categories)[cat_idx]
+        
+        # Uniform amount within the category's range; 5% anomalies at 2-5x
+        amounts = rng.uniform(self.amount_mins[cat_idx], self.amount_maxs[cat_idx])
+        is_anomaly = rng.random(n) < 0.05
+        amounts = np.where(is_anomaly, amounts * rng.uniform(2.0, 5.0, n), amounts).round(2)
+        
+        vendors = self._pick_per_category(rng, cat_idx, self.vendor_table)
+        descriptions = self._pick_per_category(rng, cat_idx, self.description_table)
+        is_recurring = self.recurring_mask[cat_idx] & (rng.random(n) < 0.3)
+        
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return list(zip(range(1, n + 1), dates.tolist(), amounts.tolist(), vendors.tolist(), descriptions.tolist(),
+                        departments.tolist(), categories.tolist(), is_recurring.tolist(), [created_at] * n))
+
+    @staticmethod
+    def _choice_table(options_by_index):
+        """Flatten per-category option tuples into (values, offsets, lengths) arrays."""
+        flat = np.array([option for group in options_by_index for option in group], dtype=object)
+        lengths = np.array([len(group) for group in options_by_index])
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return flat, offsets, lengths
+
+    def _pick_per_category(self, rng, cat_idx, table):
+        """Pick a random option from each row's category, for all rows at once."""
+        flat, offsets, lengths = table
+        return flat[offsets[cat_idx] + rng.integers(0, lengths[cat_idx])]
+
+    def _generate_expense_rows(self, start_date, end_date, num_records):
+        """Generate expense records one at a time with the random module."""
         expenses = []
+        days_between = (end_date - start_date).days
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         for i in range(num_records):
             # Random date within range
-            days_between = (end_date - start_date).days
-            random_days = random.randint(0, days_between)
+            random_days = self.random.randint(0, days_between)
             expense_date = start_date + timedelta(days=random_days)
             
             # Random department and category
-            department = random.choice(self.departments)
-            category = random.choice(self.categories)
+            department = self.random.choice(self.departments)
+            cat_idx = self.random.randrange(len(self.categories))
+            category = self.categories[cat_idx]
             
             # 5% chance of anomaly
-            is_anomaly = random.random() < 0.05
+            is_anomaly = self.random.random() < 0.05
             
             # Generate realistic vendor and amount
-            vendor = random.choice(self.vendors_by_category.get(category, ["Generic Vendor"]))
+            vendor = self.random.choice(self.vendors_by_index[cat_idx])
             amount = self.generate_expense_amount(category, is_anomaly)
             
             # Generate description
-            descriptions = {
-                "IT Infrastructure": ["Cloud hosting costs", "Software licenses", "API usage fees"],
-                "Marketing": ["Ad campaign", "Marketing tools subscription", "Content creation"],
-                "Travel": ["Business trip", "Conference travel", "Client meeting travel"],
-                "Office Supplies": ["Office materials", "Desk supplies", "Meeting room supplies"],
-                "Personnel": ["Contractor payment", "Recruitment fees", "Employee benefits"],
-                "Utilities": ["Monthly utilities", "Internet service", "Phone service"],
-                "Professional Services": ["Legal consultation", "Accounting services", "Business consulting"],
-                "Training": ["Online course", "Professional certification", "Conference registration"],
-                "Equipment": ["Computer equipment", "Office furniture", "Software/hardware"],
-                "Other": ["Miscellaneous expense", "General business cost"]
-            }
-            
-            description = random.choice(descriptions.get(category, ["Business expense"]))
+            description = self.random.choice(self.descriptions_by_index[cat_idx])
             
             # Determine if recurring
-            recurring_categories = ["IT Infrastructure", "Utilities", "Personnel"]
-            is_recurring = category in recurring_categories and random.random() < 0.3
-            
-            expense = {
-                "id": i + 1,
-                "date": expense_date.strftime("%Y-%m-%d"),
-                "amount": amount,
-                "vendor": vendor,
-                "description": description,
-                "department": department,
-                "category": category,
-                "is_recurring": is_recurring,
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            is_recurring = category in self.recurring_categories and self.random.random() < 0.3
             
-            expenses.append(expense)
+            expenses.append((i + 1, expense_date.isoformat(), amount, vendor, description,
+                             department, category, is_recurring, created_at))
         
-        # Save to CSV
-        csv_file = "data/expenses.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as file:
-            fieldnames = ["id", "date", "amount", "vendor", "description", "department", "category", "is_recurring", "created_at"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(expenses)
-        
-        print(f"✅ Generated {len(expenses)} expense records saved to {csv_file}")
         return expenses
 
-    def generate_budgets_csv(self, year=2024):
+    def generate_budgets_csv(self, year=2024, rng=None):
         """Generate budget allocations and save to CSV."""
         print(f"Generating budget allocations for {year}...")
+        rng = rng or self.random
         
         budgets = []
         budget_id = 1
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         for month in range(1, 13):  # 12 months
             period_start = date(year, month, 1)
@@ -233,30 +319,16 @@ class SimpleSyntheticDataGenerator:
             for department, categories in self.department_budgets.items():
                 for category, monthly_amount in categories.items():
                     # Add some variation to budgets (±10%)
-                    variation = random.uniform(0.9, 1.1)
+                    variation = rng.uniform(0.9, 1.1)
                     allocated_amount = round(monthly_amount * variation, 2)
                     
-                    budget = {
-                        "id": budget_id,
-                        "department": department,
-                        "category": category,
-                        "period_start": period_start.strftime("%Y-%m-%d"),
-                        "period_end": period_end.strftime("%Y-%m-%d"),
-                        "allocated_amount": allocated_amount,
-                        "spent_amount": 0.0,
-                        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    
-                    budgets.append(budget)
+                    budgets.append((budget_id, department, category, period_start.isoformat(),
+                                    period_end.isoformat(), allocated_amount, 0.0, created_at))
                     budget_id += 1
         
         # Save to CSV
         csv_file = "data/budgets.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as file:
-            fieldnames = ["id", "department", "category", "period_start", "period_end", "allocated_amount", "spent_amount", "created_at"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(budgets)
+        self._write_csv(csv_file, budgets, header=BUDGET_FIELDNAMES)
         
         print(f"✅ Generated {len(budgets)} budget records saved to {csv_file}")
         return budgets
@@ -267,54 +339,34 @@ class SimpleSyntheticDataGenerator:
         
         seasonal_expenses = []
         expense_id = len(expenses) + 1
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Q4 increased marketing spend
         for month in [10, 11, 12]:
             for _ in range(20):  # Extra marketing expenses
-                expense_date = date(2024, month, random.randint(1, 28))
+                expense_date = date(2024, month, self.random.randint(1, 28))
                 amount = self.generate_expense_amount("Marketing") * 1.5
                 
-                expense = {
-                    "id": expense_id,
-                    "date": expense_date.strftime("%Y-%m-%d"),
-                    "amount": round(amount, 2),
-                    "vendor": random.choice(self.vendors_by_category["Marketing"]),
-                    "description": "Holiday campaign spending",
-                    "department": "Marketing",
-                    "category": "Marketing",
-                    "is_recurring": False,
-                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                seasonal_expenses.append(expense)
+                seasonal_expenses.append((expense_id, expense_date.isoformat(), round(amount, 2),
+                                          self.random.choice(self.vendors_by_category["Marketing"]),
+                                          "Holiday campaign spending", "Marketing", "Marketing", False, created_at))
                 expense_id += 1
         
         # Summer conference travel
         for month in [6, 7, 8]:
             for _ in range(15):
-                expense_date = date(2024, month, random.randint(1, 28))
+                expense_date = date(2024, month, self.random.randint(1, 28))
                 amount = self.generate_expense_amount("Travel") * 1.3
-                department = random.choice(["Engineering", "Sales"])
+                department = self.random.choice(["Engineering", "Sales"])
                 
-                expense = {
-                    "id": expense_id,
-                    "date": expense_date.strftime("%Y-%m-%d"),
-                    "amount": round(amount, 2),
-                    "vendor": random.choice(self.vendors_by_category["Travel"]),
-                    "description": "Summer conference travel",
-                    "department": department,
-                    "category": "Travel",
-                    "is_recurring": False,
-                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                seasonal_expenses.append(expense)
+                seasonal_expenses.append((expense_id, expense_date.isoformat(), round(amount, 2),
+                                          self.random.choice(self.vendors_by_category["Travel"]),
+                                          "Summer conference travel", department, "Travel", False, created_at))
                 expense_id += 1
         
         # Append to existing CSV
         csv_file = "data/expenses.csv"
-        with open(csv_file, 'a', newline='', encoding='utf-8') as file:
-            fieldnames = ["id", "date", "amount", "vendor", "description", "department", "category", "is_recurring", "created_at"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writerows(seasonal_expenses)
+        self._write_csv(csv_file, seasonal_expenses, mode='a')
         
         print(f"✅ Added {len(seasonal_expenses)} seasonal expenses")
         return seasonal_expenses
@@ -323,70 +375,51 @@ class SimpleSyntheticDataGenerator:
         """Generate summary statistics and save to JSON."""
         print("Generating data summary...")
         
-        # Read expenses CSV
-        expenses = []
+        # Aggregate expenses in one streaming pass; each summary entry is [count, total cents]
+        total_expenses = 0
+        total_cents = 0
+        dept_summary = defaultdict(lambda: [0, 0])
+        cat_summary = defaultdict(lambda: [0, 0])
+        vendor_summary = defaultdict(lambda: [0, 0])
         with open("data/expenses.csv", 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            expenses = list(reader)
-        
-        # Read budgets CSV
-        budgets = []
-        with open("data/budgets.csv", 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            budgets = list(reader)
-        
-        # Calculate summaries
-        total_expenses = len(expenses)
-        total_amount = sum(float(exp['amount']) for exp in expenses)
-        
-        # Department summary
-        dept_summary = {}
-        for exp in expenses:
-            dept = exp['department']
-            if dept not in dept_summary:
-                dept_summary[dept] = {"count": 0, "total": 0}
-            dept_summary[dept]["count"] += 1
-            dept_summary[dept]["total"] += float(exp['amount'])
-        
-        # Category summary
-        cat_summary = {}
-        for exp in expenses:
-            cat = exp['category']
-            if cat not in cat_summary:
-                cat_summary[cat] = {"count": 0, "total": 0}
-            cat_summary[cat]["count"] += 1
-            cat_summary[cat]["total"] += float(exp['amount'])
+            for exp in csv.DictReader(file):
+                cents = round(float(exp['amount']) * 100)
+                total_expenses += 1
+                total_cents += cents
+                for entry in (dept_summary[exp['department']], cat_summary[exp['category']], vendor_summary[exp['vendor']]):
+                    entry[0] += 1
+                    entry[1] += cents
         
         # Budget summary
-        total_budgets = len(budgets)
-        total_allocated = sum(float(budget['allocated_amount']) for budget in budgets)
-        
-        # Top vendors
-        vendor_summary = {}
-        for exp in expenses:
-            vendor = exp['vendor']
-            if vendor not in vendor_summary:
-                vendor_summary[vendor] = {"transactions": 0, "total": 0}
-            vendor_summary[vendor]["transactions"] += 1
-            vendor_summary[vendor]["total"] += float(exp['amount'])
+        total_budgets = 0
+        allocated_cents = 0
+        with open("data/budgets.csv", 'r', encoding='utf-8') as file:
+            for budget in csv.DictReader(file):
+                total_budgets += 1
+                allocated_cents += round(float(budget['allocated_amount']) * 100)
         
         # Sort top vendors
-        top_vendors = sorted(vendor_summary.items(), key=lambda x: x[1]['total'], reverse=True)[:10]
+        top_vendors = heapq.nlargest(10, vendor_summary.items(), key=lambda x: x[1][1])
         
         summary = {
             "generated_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "total_expenses": total_expenses,
-            "total_amount": round(total_amount, 2),
+            "total_amount": total_cents / 100,
             "total_budgets": total_budgets,
-            "total_allocated": round(total_allocated, 2),
-            "departments": {k: {"count": v["count"], "total": round(v["total"], 2)} for k, v in dept_summary.items()},
-            "categories": {k: {"count": v["count"], "total": round(v["total"], 2)} for k, v in cat_summary.items()},
-            "top_vendors": [{"vendor": vendor, "transactions": data["transactions"], "total": round(data["total"], 2)} for vendor, data in top_vendors]
+            "total_allocated": allocated_cents / 100,
+            "departments": {k: {"count": count, "total": cents / 100} for k, (count, cents) in dept_summary.items()},
+            "categories": {k: {"count": count, "total": cents / 100} for k, (count, cents) in cat_summary.items()},
+            "top_vendors": [{"vendor": vendor, "transactions": count, "total": cents / 100} for vendor, (count, cents) in top_vendors]
         }
         
         # Save summary
-        with open("data/summary.json", 'w', encoding='utf-8') as file:
-            json.dump(summary, file, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open("data/summary.json", 'wb') as file:
+                file.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        else:
+            payload = json.dumps(summary, indent=2, ensure_ascii=False)
+            with open("data/summary.json", 'w', encoding='utf-8') as file:
+                file.write(payload)
         
         return summary
 
@@ -423,10 +456,14 @@ class SimpleSyntheticDataGenerator:
         start_date = end_date - timedelta(days=months_back * 30)
         
         try:
-            # Generate core data
-            expenses = self.generate_expenses_csv(start_date, end_date, num_records=1500)
-            budgets = self.generate_budgets_csv(year=2024)
-            seasonal = self.add_seasonal_patterns(expenses)
+            # Generate core data; budgets are independent of expenses, so build them
+            # on a worker thread with their own RNG, seeded from the generator's source
+            budget_rng = random.Random(self.random.getrandbits(64))
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                budgets_future = executor.submit(self.generate_budgets_csv, 2024, budget_rng)
+                expenses = self.generate_expenses_csv(start_date, end_date, num_records=1500)
+                seasonal = self.add_seasonal_patterns(expenses)
+                budgets = budgets_future.result()
             
             # Generate summary
             summary = self.generate_summary_json()
@@ -446,7 +483,11 @@ class SimpleSyntheticDataGenerator:
 
 def main():
     """Main function to run data generation."""
-    generator = SimpleSyntheticDataGenerator()
+    parser = argparse.ArgumentParser(description="Generate synthetic Nsight budgeting data")
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for a reproducible dataset')
+    args = parser.parse_args()
+    
+    generator = SimpleSyntheticDataGenerator(seed=args.seed)
     generator.generate_all_data(months_back=12)
 
 if __name__ == "__main__":
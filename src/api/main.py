@@ -1,6 +1,6 @@
 """FastAPI backend for Nsight AI Budgeting System dashboard."""
 
-from fastapi import FastAPI, HTTPException, Query, Depends, UploadFile, File
+from fastapi import FastAPI, HTTPException, Query, Depends, UploadFile, File, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, validator
@@ -14,6 +14,15 @@ import pandas as pd
 from io import BytesIO, StringIO
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +43,14 @@ except ImportError:
     from src.ml.budget_forecaster import BudgetForecaster
     from src.ml.anomaly_detector import AnomalyDetector
 
+def records_response(request: Request, records: List[Dict], payload: Dict):
+    """Return records as an Arrow IPC file when the client accepts it, otherwise the JSON payload."""
+    if PYARROW_AVAILABLE and ARROW_MEDIA_TYPE in request.headers.get("accept", ""):
+        sink = pa.BufferOutputStream()
+        feather.write_feather(pa.Table.from_pylist(records), sink)
+        return Response(content=sink.getvalue().to_pybytes(), media_type=ARROW_MEDIA_TYPE)
+    return payload
+
 # Pydantic models for API requests/responses
 class ExpenseCreate(BaseModel):
     date: str
@@ -52,6 +69,12 @@ class BudgetCreate(BaseModel):
     allocated_amount: float
     currency: str = "USD"
 
+class ExpenseBulkCreate(BaseModel):
+    items: List[ExpenseCreate]
+
+class BudgetBulkCreate(BaseModel):
+    items: List[BudgetCreate]
+
 class PredictionRequest(BaseModel):
     vendor: str
     description: str = ""
@@ -90,6 +113,7 @@ class DashboardStats(BaseModel):
     total_allocated: float
     anomaly_rate: float
     recent_expenses: List[Dict]
+    currency_summary: List[Dict] = []
 
 # FastAPI app initialization
 app = FastAPI(
@@ -193,7 +217,8 @@ async def get_dashboard_stats(processor: DataProcessor = Depends(get_data_proces
             total_budgets=summary['total_budgets'],
             total_allocated=summary['total_allocated'],
             anomaly_rate=anomaly_rate,
-            recent_expenses=summary.get('recent_expenses', [])
+            recent_expenses=summary.get('recent_expenses', []),
+            currency_summary=summary.get('currency_summary', [])
         )
     
     except Exception as e:
@@ -203,6 +228,7 @@ async def get_dashboard_stats(processor: DataProcessor = Depends(get_data_proces
 # Expense endpoints
 @app.get("/expenses")
 async def get_expenses(
+    request: Request,
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
     department: Optional[str] = None,
@@ -210,9 +236,14 @@ async def get_expenses(
     currency: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    vendor: Optional[str] = None,
+    is_recurring: Optional[bool] = None,
+    include_currency_summary: bool = False,
     processor: DataProcessor = Depends(get_data_processor)
 ):
-    """Get expenses with optional filtering."""
+    """Get expenses with optional filtering (comma-separated lists allowed), optionally with per-currency totals."""
     try:
         # Build filters
         filters = {}
@@ -226,9 +257,29 @@ async def get_expenses(
             filters['start_date'] = start_date
         if end_date:
             filters['end_date'] = end_date
+        if min_amount is not None:
+            filters['min_amount'] = min_amount
+        if max_amount is not None:
+            filters['max_amount'] = max_amount
+        if vendor:
+            filters['vendor'] = vendor
+        if is_recurring is not None:
+            filters['is_recurring'] = is_recurring
+        
+        # Newline-delimited JSON lets clients render rows as they arrive; rows are
+        # serialized straight off the database cursor instead of building the list first
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                (json.dumps(expense) + "\n"
+                 for expense in processor.iter_expenses(limit=limit, offset=offset, filters=filters)),
+                media_type="application/x-ndjson"
+            )
         
         expenses = processor.get_expenses(limit=limit, offset=offset, filters=filters)
-        return {"data": expenses, "total": len(expenses)}
+        response = {"data": expenses, "total": len(expenses)}
+        if include_currency_summary:
+            response["currency_summary"] = processor.get_currency_summary(filters=filters)
+        return response
     
     except Exception as e:
         logger.error(f"Get expenses error: {e}")
@@ -268,6 +319,41 @@ async def create_expense(
         logger.error(f"Create expense error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/expenses/bulk")
+async def create_expenses_bulk(
+    request: ExpenseBulkCreate,
+    processor: DataProcessor = Depends(get_data_processor)
+):
+    """Create many expense records in a single transaction."""
+    try:
+        # Auto-categorize uncategorized rows with one shared classifier
+        if any(not expense.category for expense in request.items):
+            classifier = get_expense_classifier()
+            if classifier:
+                for expense in request.items:
+                    if not expense.category:
+                        expense.category, _ = classifier.predict_category(expense.vendor, expense.description)
+        
+        results = processor.add_expenses_bulk([
+            {
+                "date": expense.date,
+                "amount": expense.amount,
+                "vendor": expense.vendor,
+                "description": expense.description,
+                "department": expense.department,
+                "category": expense.category or 'Other',
+                "currency": expense.currency
+            }
+            for expense in request.items
+        ])
+        
+        created = sum(1 for result in results if result['success'])
+        return {"created": created, "failed": len(results) - created, "results": results}
+    
+    except Exception as e:
+        logger.error(f"Bulk create expenses error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Budget endpoints
 @app.get("/budgets")
 async def get_budgets(
@@ -275,15 +361,24 @@ async def get_budgets(
     offset: int = Query(0, ge=0),
     department: Optional[str] = None,
     category: Optional[str] = None,
+    currency: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
     processor: DataProcessor = Depends(get_data_processor)
 ):
-    """Get budgets with optional filtering."""
+    """Get budgets with optional filtering; department, category and currency accept comma-separated lists."""
     try:
         filters = {}
         if department:
             filters['department'] = department
         if category:
             filters['category'] = category
+        if currency:
+            filters['currency'] = currency
+        if start_date:
+            filters['start_date'] = start_date
+        if end_date:
+            filters['end_date'] = end_date
         
         budgets = processor.get_budgets(limit=limit, offset=offset, filters=filters)
         return {"budgets": budgets, "total": len(budgets)}
@@ -307,16 +402,48 @@ async def create_budget(
             allocated_amount=budget.allocated_amount,
             currency=budget.currency
         )
+    except Exception as e:
+        logger.error(f"Create budget error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if result.get('success'):
+        return {"message": "Budget created successfully", "id": result.get('id')}
+    if result.get('duplicate'):
+        raise HTTPException(status_code=409, detail=result.get('error', 'Budget already exists'))
+    raise HTTPException(status_code=400, detail=result.get('error', 'Failed to create budget'))
+
+@app.post("/budgets/bulk")
+async def create_budgets_bulk(
+    request: BudgetBulkCreate,
+    processor: DataProcessor = Depends(get_data_processor)
+):
+    """Create many budget records in a single transaction."""
+    try:
+        results = processor.add_budgets_bulk([budget.model_dump() for budget in request.items])
         
-        if result.get('success'):
-            return {"message": "Budget created successfully", "id": result.get('id')}
-        else:
-            raise HTTPException(status_code=400, detail=result.get('error', 'Failed to create budget'))
+        created = sum(1 for result in results if result['success'])
+        return {"created": created, "failed": len(results) - created, "results": results}
     
     except Exception as e:
-        logger.error(f"Create budget error: {e}")
+        logger.error(f"Bulk create budgets error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.delete("/budgets/{budget_id}")
+async def delete_budget(
+    budget_id: int,
+    processor: DataProcessor = Depends(get_data_processor)
+):
+    """Delete a budget record."""
+    try:
+        result = processor.delete_budget(budget_id)
+    except Exception as e:
+        logger.error(f"Delete budget error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not result.get('success'):
+        raise HTTPException(status_code=404, detail=result.get('error', 'Budget not found'))
+    return {"message": "Budget deleted successfully", "id": budget_id}
+
 # CSV Import endpoints
 @app.post("/budgets/import")
 async def import_budgets_csv(
@@ -344,7 +471,7 @@ async def import_budgets_csv(
                 "success": result.success,
                 "message": result.message,
                 "records_processed": result.records_processed,
-                "errors": result.errors[:10] if result.errors else []  # Limit errors shown
+                "errors": result.errors
             }
         
         finally:
@@ -381,7 +508,7 @@ async def import_expenses_csv(
                 "success": result.success,
                 "message": result.message,
                 "records_processed": result.records_processed,
-                "errors": result.errors[:10] if result.errors else []  # Limit errors shown
+                "errors": result.errors
             }
         
         finally:
@@ -570,6 +697,40 @@ async def detect_anomalies(
         logger.error(f"Anomaly detection error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/anomalies/scores")
+async def get_anomaly_scores(
+    data_file: str = Query("data/expenses.csv"),
+    min_score: float = Query(0.5, ge=0.0, le=1.0),
+    detector: AnomalyDetector = Depends(get_anomaly_detector)
+):
+    """Score expenses once so clients can apply their own threshold; only scores >= min_score are returned."""
+    if not Path(data_file).exists():
+        raise HTTPException(status_code=404, detail=f"Data file not found: {data_file}")
+    
+    try:
+        detector.anomaly_threshold = min_score
+        
+        if not detector.load_historical_data(data_file):
+            raise ValueError("Failed to load historical data")
+        
+        training_results = detector.train_anomaly_models()
+        if 'error' in training_results:
+            raise ValueError(training_results['error'])
+        
+        results = detector.detect_anomalies()
+        if 'error' in results:
+            raise ValueError(results['error'])
+        
+        return {
+            "total_expenses": results['total_expenses'],
+            "min_score": min_score,
+            "anomalies": results['anomalies']
+        }
+    
+    except Exception as e:
+        logger.error(f"Anomaly scoring error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/anomalies/summary")
 async def get_anomaly_summary(
     data_file: str = Query("data/expenses.csv"),
@@ -603,13 +764,15 @@ async def get_anomaly_summary(
 # Dashboard-specific endpoints for charts and visualizations
 @app.get("/dashboard/spending-by-department")
 async def get_spending_by_department(
+    request: Request,
     months: int = Query(12, ge=1, le=24),
+    top_n: Optional[int] = Query(None, ge=1, le=100),
     processor: DataProcessor = Depends(get_data_processor)
 ):
-    """Get spending breakdown by department for dashboard charts."""
+    """Get spending breakdown by department for dashboard charts, largest first."""
     try:
-        data = processor.get_spending_by_department(months=months)
-        return {"data": data, "months": months}
+        data = processor.get_spending_by_department(months=months, top_n=top_n)
+        return records_response(request, data, {"data": data, "months": months})
     
     except Exception as e:
         logger.error(f"Department spending error: {e}")
@@ -617,13 +780,15 @@ async def get_spending_by_department(
 
 @app.get("/dashboard/spending-by-category")
 async def get_spending_by_category(
+    request: Request,
     months: int = Query(12, ge=1, le=24),
+    top_n: Optional[int] = Query(None, ge=1, le=100),
     processor: DataProcessor = Depends(get_data_processor)
 ):
-    """Get spending breakdown by category for dashboard charts."""
+    """Get spending breakdown by category for dashboard charts, largest first."""
     try:
-        data = processor.get_spending_by_category(months=months)
-        return {"data": data, "months": months}
+        data = processor.get_spending_by_category(months=months, top_n=top_n)
+        return records_response(request, data, {"data": data, "months": months})
     
     except Exception as e:
         logger.error(f"Category spending error: {e}")
@@ -631,13 +796,14 @@ async def get_spending_by_category(
 
 @app.get("/dashboard/monthly-trends")
 async def get_monthly_spending_trends(
+    request: Request,
     months: int = Query(12, ge=1, le=24),
     processor: DataProcessor = Depends(get_data_processor)
 ):
     """Get monthly spending trends for dashboard time series charts."""
     try:
         data = processor.get_monthly_trends(months=months)
-        return {"data": data, "months": months}
+        return records_response(request, data, {"data": data, "months": months})
     
     except Exception as e:
         logger.error(f"Monthly trends error: {e}")
@@ -673,7 +839,7 @@ async def get_recent_alerts(
 # Export endpoints
 @app.get("/export/expenses")
 async def export_expenses(
-    format: str = Query("csv", regex="^(csv|excel|json)$"),
+    format: str = Query("csv", regex="^(csv|excel|json|arrow)$"),
     currency: Optional[str] = None,
     department: Optional[str] = None,
     category: Optional[str] = None,
@@ -699,6 +865,10 @@ async def export_expenses(
             filters['start_date'] = start_date
         if end_date:
             filters['end_date'] = end_date
+        if min_amount is not None:
+            filters['min_amount'] = min_amount
+        if max_amount is not None:
+            filters['max_amount'] = max_amount
         if vendor:
             filters['vendor'] = vendor
         if is_recurring is not None:
@@ -707,25 +877,13 @@ async def export_expenses(
         # Get filtered expenses (remove limit for export)
         expenses = processor.get_expenses(limit=10000, filters=filters)
         
-        # Apply amount filtering if specified
-        if min_amount is not None or max_amount is not None:
-            filtered_expenses = []
-            for expense in expenses:
-                amount = expense.get('amount', 0)
-                if min_amount is not None and amount < min_amount:
-                    continue
-                if max_amount is not None and amount > max_amount:
-                    continue
-                filtered_expenses.append(expense)
-            expenses = filtered_expenses
-        
         # Generate filename with timestamp and filters
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filter_parts = []
         if currency:
-            filter_parts.append(currency)
+            filter_parts.append(currency.replace(",", "-"))
         if department:
-            filter_parts.append(department.replace(" ", ""))
+            filter_parts.append(department.replace(" ", "").replace(",", "-"))
         if start_date:
             filter_parts.append(f"from{start_date}")
         
@@ -738,13 +896,15 @@ async def export_expenses(
             return export_to_excel(expenses, f"{filename}.xlsx", "Expenses")
         elif format == "json":
             return export_to_json(expenses, f"{filename}.json")
+        elif format == "arrow":
+            return export_to_arrow(expenses, f"{filename}.arrow")
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 @app.get("/export/budgets")
 async def export_budgets(
-    format: str = Query("csv", regex="^(csv|excel|json)$"),
+    format: str = Query("csv", regex="^(csv|excel|json|arrow)$"),
     currency: Optional[str] = None,
     department: Optional[str] = None,
     category: Optional[str] = None,
@@ -774,9 +934,9 @@ async def export_budgets(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filter_parts = []
         if currency:
-            filter_parts.append(currency)
+            filter_parts.append(currency.replace(",", "-"))
         if department:
-            filter_parts.append(department.replace(" ", ""))
+            filter_parts.append(department.replace(" ", "").replace(",", "-"))
         
         filter_suffix = "_" + "_".join(filter_parts) if filter_parts else ""
         filename = f"budgets{filter_suffix}_{timestamp}"
@@ -787,6 +947,8 @@ async def export_budgets(
             return export_to_excel(budgets, f"{filename}.xlsx", "Budgets")
         elif format == "json":
             return export_to_json(budgets, f"{filename}.json")
+        elif format == "arrow":
+            return export_to_arrow(budgets, f"{filename}.arrow")
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
@@ -821,9 +983,9 @@ async def export_combined_report(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filter_parts = []
         if currency:
-            filter_parts.append(currency)
+            filter_parts.append(currency.replace(",", "-"))
         if department:
-            filter_parts.append(department.replace(" ", ""))
+            filter_parts.append(department.replace(" ", "").replace(",", "-"))
         
         filter_suffix = "_" + "_".join(filter_parts) if filter_parts else ""
         filename = f"combined_report{filter_suffix}_{timestamp}"
@@ -935,6 +1097,22 @@ def export_to_json(data, filename):
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
+def export_to_arrow(data, filename):
+    """Export data as an Arrow IPC file for clients that convert it locally."""
+    if not data:
+        raise HTTPException(status_code=404, detail="No data found matching the criteria")
+    if not PYARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow")
+    
+    sink = pa.BufferOutputStream()
+    feather.write_feather(pa.Table.from_pylist(data), sink)
+    
+    return Response(
+        content=sink.getvalue().to_pybytes(),
+        media_type=ARROW_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
@@ -1,6 +1,6 @@
 """Database setup and models for Nsight AI Budgeting System."""
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, Boolean, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, Boolean, Text, Index, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -17,6 +17,10 @@ engine = create_engine(settings.database_url, echo=settings.debug)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def round_to_cents(amount: float) -> float:
+    """Round an amount to whole cents, the precision budget uniqueness is enforced at."""
+    return int(round(float(amount) * 100)) / 100
+
 # Database Models
 class ExpenseDB(Base):
     """SQLAlchemy model for expenses."""
@@ -46,6 +50,13 @@ class BudgetDB(Base):
     currency = Column(String(3), nullable=False, default="USD", index=True)  # ISO currency code
     spent_amount = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # One budget per department/category/period/currency/amount; allocated_amount is
+        # stored rounded to cents (round_to_cents) so duplicates are rejected on insert
+        Index('uq_budget_currency', 'department', 'category', 'period_start', 'period_end',
+              'currency', 'allocated_amount', unique=True),
+    )
 
 class AnomalyDB(Base):
     """SQLAlchemy model for anomaly alerts."""
@@ -67,6 +78,10 @@ class AnomalyDB(Base):
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
+    
+    # create_all skips indexes on tables that already exist; migrate_currency.py adds it there
+    if 'uq_budget_currency' not in {index['name'] for index in inspect(engine).get_indexes('budgets')}:
+        print("⚠️  budgets has no uq_budget_currency index; run 'python migrate_currency.py' to add it")
 
 def get_db():
     """Get database session."""
@@ -8,6 +8,12 @@ from typing import Dict, List, Tuple, Optional
 from collections import Counter
 import math
 
+# Text normalisation patterns and stop words, compiled once for every prediction
+NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+DIGITS_PATTERN = re.compile(r'\d+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
 class SimpleExpenseClassifier:
     """Dependency-free expense classifier using basic ML concepts."""
     
@@ -80,16 +86,15 @@ class SimpleExpenseClassifier:
             return []
         
         # Convert to lowercase and remove special chars
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
-        text = re.sub(r'\d+', 'NUM', text)  # Replace numbers
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = NON_WORD_PATTERN.sub(' ', text.lower())
+        text = DIGITS_PATTERN.sub('NUM', text)  # Replace numbers
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
         # Simple tokenization
         words = text.split()
         
         # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        words = [w for w in words if w not in stop_words and len(w) > 2]
+        words = [w for w in words if w not in STOP_WORDS and len(w) > 2]
         
         return words
 
@@ -162,13 +167,14 @@ class SimpleExpenseClassifier:
         # Calculate training accuracy
         correct = 0
         total = len(training_data)
+        model = self._naive_bayes_model()
         
         for doc in training_data:
             vendor = doc.get('vendor', '')
             description = doc.get('description', '')
             true_category = doc.get('category', 'Other')
             
-            predicted_category, _ = self.predict_naive_bayes(vendor, description)
+            predicted_category, _ = self.predict_naive_bayes(vendor, description, model)
             if predicted_category == true_category:
                 correct += 1
         
@@ -186,8 +192,24 @@ class SimpleExpenseClassifier:
             'training_accuracy': accuracy
         }
 
-    def predict_naive_bayes(self, vendor: str, description: str = "") -> Tuple[str, float]:
-        """Predict using Naive Bayes."""
+    def _naive_bayes_model(self) -> List[Tuple[str, float, Dict, int]]:
+        """Precompute (category, log prior, word counts, likelihood denominator) for scoring."""
+        vocab_size = len(self.vocabulary)
+        model = []
+        
+        for category in self.categories:
+            if category not in self.category_counts:
+                continue
+            
+            word_counts = self.word_category_counts.get(category, {})
+            log_prior = math.log(self.category_counts[category] / self.total_documents)
+            model.append((category, log_prior, word_counts, sum(word_counts.values()) + vocab_size))
+        
+        return model
+
+    def predict_naive_bayes(self, vendor: str, description: str = "",
+                            model: Optional[List[Tuple[str, float, Dict, int]]] = None) -> Tuple[str, float]:
+        """Predict using Naive Bayes, reusing a precomputed model when one is given."""
         if not self.is_trained:
             return self.rule_based_classify(vendor, description)
         
@@ -197,27 +219,20 @@ class SimpleExpenseClassifier:
         if not words:
             return self.rule_based_classify(vendor, description)
         
+        if model is None:
+            model = self._naive_bayes_model()
+        
         # Calculate log probabilities for each category
         category_scores = {}
+        known_words = [word for word in words if word in self.vocabulary]
         
-        for category in self.categories:
-            if category not in self.category_counts:
-                continue
-                
+        for category, log_prior, word_counts, denominator in model:
             # Prior probability: P(category)
-            prior = self.category_counts[category] / self.total_documents
-            log_prob = math.log(prior)
-            
-            # Likelihood: P(word|category)
-            category_word_count = sum(self.word_category_counts.get(category, {}).values())
-            vocab_size = len(self.vocabulary)
+            log_prob = log_prior
             
-            for word in words:
-                if word in self.vocabulary:
-                    word_count = self.word_category_counts.get(category, {}).get(word, 0)
-                    # Laplace smoothing
-                    likelihood = (word_count + 1) / (category_word_count + vocab_size)
-                    log_prob += math.log(likelihood)
+            # Likelihood: P(word|category) with Laplace smoothing
+            for word in known_words:
+                log_prob += math.log((word_counts.get(word, 0) + 1) / denominator)
             
             category_scores[category] = log_prob
         
@@ -278,13 +293,17 @@ class SimpleExpenseClassifier:
         return self.train_naive_bayes(training_data)
 
     def batch_predict(self, expenses: List[Dict]) -> List[Tuple[str, float]]:
-        """Predict categories for multiple expenses."""
+        """Predict categories for multiple expenses, building the scoring model once."""
         predictions = []
+        model = self._naive_bayes_model() if self.is_trained else None
         
         for expense in expenses:
             vendor = expense.get('vendor', '')
             description = expense.get('description', '')
-            category, confidence = self.predict(vendor, description)
+            if model is not None:
+                category, confidence = self.predict_naive_bayes(vendor, description, model)
+            else:
+                category, confidence = self.rule_based_classify(vendor, description)
             predictions.append((category, confidence))
         
         return predictions
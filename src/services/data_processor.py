@@ -3,21 +3,25 @@
 import csv
 import pandas as pd
 from datetime import datetime, date
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator
 from pathlib import Path
 import re
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 
 try:
-    from ..database import SessionLocal, ExpenseDB, BudgetDB
+    from ..database import SessionLocal, ExpenseDB, BudgetDB, round_to_cents
     from ..models import ExpenseRecord, BudgetRecord, UploadResponse, DepartmentEnum, CategoryEnum
     from ..config import settings
 except ImportError:
     # For standalone execution
-    from database import SessionLocal, ExpenseDB, BudgetDB
+    from database import SessionLocal, ExpenseDB, BudgetDB, round_to_cents
     from models import ExpenseRecord, BudgetRecord, UploadResponse, DepartmentEnum, CategoryEnum
     from config import settings
 
+# Row errors returned from a CSV upload; the dashboard renders the first 100 of them
+MAX_UPLOAD_ERRORS = 1000
+
 class DataProcessor:
     """Handles CSV data ingestion, validation, and database operations."""
     
@@ -400,7 +404,7 @@ class DataProcessor:
                 success=success,
                 message=message,
                 records_processed=processed_records,
-                errors=self.errors[:10]  # Limit to first 10 errors
+                errors=self.errors[:MAX_UPLOAD_ERRORS]
             )
         
         except Exception as e:
@@ -479,14 +483,20 @@ class DataProcessor:
                     category=category,
                     period_start=period_start,
                     period_end=period_end,
-                    allocated_amount=allocated_amount,
+                    allocated_amount=round_to_cents(allocated_amount),
                     currency=currency,
                     spent_amount=0.0,  # Will be calculated later
                     created_at=datetime.utcnow()
                 )
                 
-                valid_budgets.append(budget)
-                processed_records += 1
+                valid_budgets.append((index + 2, budget))
+            
+            # Skip budgets already stored or repeated earlier in the file, row by row
+            duplicates = self._duplicate_budget_positions([budget for _, budget in valid_budgets])
+            for position in sorted(duplicates):
+                self.errors.append(f"Row {valid_budgets[position][0]}: Budget already exists")
+            valid_budgets = [budget for position, (_, budget) in enumerate(valid_budgets) if position not in duplicates]
+            processed_records = len(valid_budgets)
             
             # Bulk insert valid records
             if valid_budgets:
@@ -503,7 +513,7 @@ class DataProcessor:
                 success=success,
                 message=message,
                 records_processed=processed_records,
-                errors=self.errors[:10]  # Limit to first 10 errors
+                errors=self.errors[:MAX_UPLOAD_ERRORS]
             )
         
         except Exception as e:
@@ -552,49 +562,104 @@ class DataProcessor:
                         "category": exp.category
                     }
                     for exp in recent_expenses
-                ]
+                ],
+                "currency_summary": self.get_currency_summary()
             }
         
         except Exception as e:
             return {"error": str(e)}
     
-    def get_expenses(self, limit: int = 100, offset: int = 0, filters: Dict = None) -> List[Dict]:
-        """Get expenses with optional filtering."""
+    @staticmethod
+    def _match(column, value: str):
+        """Equality filter that also accepts a comma-separated list of values."""
+        values = [item.strip() for item in str(value).split(',') if item.strip()]
+        return column.in_(values) if len(values) > 1 else column == values[0]
+    
+    def _filter_expenses(self, query, filters: Dict = None):
+        """Apply the optional expense filters shared by the listing and summary queries."""
+        if filters:
+            if filters.get('department'):
+                query = query.filter(self._match(ExpenseDB.department, filters['department']))
+            if filters.get('category'):
+                query = query.filter(self._match(ExpenseDB.category, filters['category']))
+            if filters.get('currency'):
+                query = query.filter(self._match(ExpenseDB.currency, filters['currency']))
+            if filters.get('start_date'):
+                query = query.filter(ExpenseDB.date >= filters['start_date'])
+            if filters.get('end_date'):
+                query = query.filter(ExpenseDB.date <= filters['end_date'])
+            if filters.get('min_amount') is not None:
+                query = query.filter(ExpenseDB.amount >= filters['min_amount'])
+            if filters.get('max_amount') is not None:
+                query = query.filter(ExpenseDB.amount <= filters['max_amount'])
+            if filters.get('vendor'):
+                query = query.filter(ExpenseDB.vendor.ilike(f"%{filters['vendor']}%"))
+            if filters.get('is_recurring') is not None:
+                query = query.filter(ExpenseDB.is_recurring == filters['is_recurring'])
+        return query
+    
+    def get_currency_summary(self, filters: Dict = None) -> List[Dict]:
+        """Count and total expenses per currency."""
         try:
-            query = self.db.query(ExpenseDB)
-            
-            if filters:
-                if filters.get('department'):
-                    query = query.filter(ExpenseDB.department == filters['department'])
-                if filters.get('category'):
-                    query = query.filter(ExpenseDB.category == filters['category'])
-                if filters.get('currency'):
-                    query = query.filter(ExpenseDB.currency == filters['currency'])
-                if filters.get('start_date'):
-                    query = query.filter(ExpenseDB.date >= filters['start_date'])
-                if filters.get('end_date'):
-                    query = query.filter(ExpenseDB.date <= filters['end_date'])
+            from sqlalchemy import func
             
-            expenses = query.order_by(ExpenseDB.date.desc()).offset(offset).limit(limit).all()
+            query = self.db.query(
+                ExpenseDB.currency,
+                func.count(ExpenseDB.id).label('count'),
+                func.sum(ExpenseDB.amount).label('total')
+            )
+            results = self._filter_expenses(query, filters).group_by(
+                ExpenseDB.currency
+            ).order_by(
+                ExpenseDB.currency
+            ).all()
             
             return [
                 {
-                    'id': exp.id,
-                    'date': exp.date.strftime('%Y-%m-%d'),
-                    'amount': float(exp.amount),
-                    'currency': getattr(exp, 'currency', 'USD'),
-                    'vendor': exp.vendor,
-                    'description': exp.description,
-                    'department': exp.department,
-                    'category': exp.category,
-                    'created_at': exp.created_at.isoformat() if exp.created_at else None
+                    'currency': result.currency,
+                    'count': result.count,
+                    'total': round(float(result.total), 2)
                 }
-                for exp in expenses
+                for result in results
             ]
             
+        except Exception:
+            return []
+    
+    @staticmethod
+    def _expense_dict(exp: ExpenseDB) -> Dict:
+        """Serialize an expense row for the API."""
+        return {
+            'id': exp.id,
+            'date': exp.date.strftime('%Y-%m-%d'),
+            'amount': float(exp.amount),
+            'currency': getattr(exp, 'currency', 'USD'),
+            'vendor': exp.vendor,
+            'description': exp.description,
+            'department': exp.department,
+            'category': exp.category,
+            'created_at': exp.created_at.isoformat() if exp.created_at else None
+        }
+    
+    def _expenses_query(self, limit: int, offset: int, filters: Dict = None):
+        """Filtered, newest-first expense query shared by the list and stream readers."""
+        query = self._filter_expenses(self.db.query(ExpenseDB), filters)
+        return query.order_by(ExpenseDB.date.desc()).offset(offset).limit(limit)
+    
+    def get_expenses(self, limit: int = 100, offset: int = 0, filters: Dict = None) -> List[Dict]:
+        """Get expenses with optional filtering."""
+        try:
+            return [self._expense_dict(exp) for exp in self._expenses_query(limit, offset, filters)]
+            
         except Exception as e:
             return []
     
+    def iter_expenses(self, limit: int = 100, offset: int = 0, filters: Dict = None,
+                      batch_size: int = 100) -> Iterator[Dict]:
+        """Yield filtered expenses as rows are fetched from the cursor, batch_size at a time."""
+        for exp in self._expenses_query(limit, offset, filters).yield_per(batch_size):
+            yield self._expense_dict(exp)
+    
     def get_budgets(self, limit: int = 100, offset: int = 0, filters: Dict = None) -> List[Dict]:
         """Get budgets with optional filtering."""
         try:
@@ -602,11 +667,11 @@ class DataProcessor:
             
             if filters:
                 if filters.get('department'):
-                    query = query.filter(BudgetDB.department == filters['department'])
+                    query = query.filter(self._match(BudgetDB.department, filters['department']))
                 if filters.get('category'):
-                    query = query.filter(BudgetDB.category == filters['category'])
+                    query = query.filter(self._match(BudgetDB.category, filters['category']))
                 if filters.get('currency'):
-                    query = query.filter(BudgetDB.currency == filters['currency'])
+                    query = query.filter(self._match(BudgetDB.currency, filters['currency']))
                 if filters.get('start_date'):
                     query = query.filter(BudgetDB.period_start >= filters['start_date'])
                 if filters.get('end_date'):
@@ -632,39 +697,47 @@ class DataProcessor:
         except Exception as e:
             return []
     
+    def _build_expense(self, date: str, amount: float, vendor: str, description: str, 
+                       department: str, category: str, currency: str = "USD") -> Tuple[Optional[ExpenseDB], Optional[str]]:
+        """Validate expense fields and build an unsaved ExpenseDB row."""
+        date_valid, expense_date = self.validate_date(date)
+        if not date_valid:
+            return None, f'Invalid date: {date}'
+        
+        dept_valid, validated_dept = self.validate_department(department)
+        if not dept_valid:
+            return None, f'Invalid department: {department}'
+        
+        cat_valid, validated_cat = self.validate_category(category)
+        if not cat_valid:
+            # Auto-categorize if invalid
+            validated_cat = self.auto_categorize_expense(vendor, description)
+        
+        currency_valid, validated_currency = self.validate_currency(currency)
+        if not currency_valid:
+            return None, f'Invalid currency: {currency}'
+        
+        expense = ExpenseDB(
+            date=expense_date,
+            amount=amount,
+            currency=validated_currency,
+            vendor=vendor,
+            description=description,
+            department=validated_dept,
+            category=validated_cat,
+            is_recurring=False,
+            created_at=datetime.utcnow()
+        )
+        return expense, None
+    
     def add_expense(self, date: str, amount: float, vendor: str, description: str, 
                    department: str, category: str, currency: str = "USD") -> Dict:
         """Add a new expense record."""
         try:
-            # Validate inputs
-            date_valid, expense_date = self.validate_date(date)
-            if not date_valid:
-                return {'success': False, 'error': f'Invalid date: {date}'}
-            
-            dept_valid, validated_dept = self.validate_department(department)
-            if not dept_valid:
-                return {'success': False, 'error': f'Invalid department: {department}'}
-            
-            cat_valid, validated_cat = self.validate_category(category)
-            if not cat_valid:
-                # Auto-categorize if invalid
-                validated_cat = self.auto_categorize_expense(vendor, description)
-            
-            currency_valid, validated_currency = self.validate_currency(currency)
-            if not currency_valid:
-                return {'success': False, 'error': f'Invalid currency: {currency}'}
-            
-            expense = ExpenseDB(
-                date=expense_date,
-                amount=amount,
-                currency=validated_currency,
-                vendor=vendor,
-                description=description,
-                department=validated_dept,
-                category=validated_cat,
-                is_recurring=False,
-                created_at=datetime.utcnow()
-            )
+            expense, error = self._build_expense(date, amount, vendor, description,
+                                                 department, category, currency)
+            if error:
+                return {'success': False, 'error': error}
             
             self.db.add(expense)
             self.db.commit()
@@ -675,53 +748,170 @@ class DataProcessor:
             self.db.rollback()
             return {'success': False, 'error': str(e)}
     
+    def _build_budget(self, department: str, category: str, period_start: str, 
+                      period_end: str, allocated_amount: float, currency: str = "USD") -> Tuple[Optional[BudgetDB], Optional[str]]:
+        """Validate budget fields and build an unsaved BudgetDB row."""
+        start_valid, start_date = self.validate_date(period_start)
+        if not start_valid:
+            return None, f'Invalid period_start: {period_start}'
+        
+        end_valid, end_date = self.validate_date(period_end)
+        if not end_valid:
+            return None, f'Invalid period_end: {period_end}'
+        
+        dept_valid, validated_dept = self.validate_department(department)
+        if not dept_valid:
+            return None, f'Invalid department: {department}'
+        
+        cat_valid, validated_cat = self.validate_category(category)
+        if not cat_valid:
+            return None, f'Invalid category: {category}'
+        
+        currency_valid, validated_currency = self.validate_currency(currency)
+        if not currency_valid:
+            return None, f'Invalid currency: {currency}'
+        
+        budget = BudgetDB(
+            department=validated_dept,
+            category=validated_cat,
+            period_start=start_date,
+            period_end=end_date,
+            allocated_amount=round_to_cents(allocated_amount),
+            currency=validated_currency,
+            spent_amount=0.0,
+            created_at=datetime.utcnow()
+        )
+        return budget, None
+    
     def add_budget(self, department: str, category: str, period_start: str, 
                   period_end: str, allocated_amount: float, currency: str = "USD") -> Dict:
         """Add a new budget record."""
         try:
-            # Validate inputs
-            start_valid, start_date = self.validate_date(period_start)
-            if not start_valid:
-                return {'success': False, 'error': f'Invalid period_start: {period_start}'}
-            
-            end_valid, end_date = self.validate_date(period_end)
-            if not end_valid:
-                return {'success': False, 'error': f'Invalid period_end: {period_end}'}
-            
-            dept_valid, validated_dept = self.validate_department(department)
-            if not dept_valid:
-                return {'success': False, 'error': f'Invalid department: {department}'}
-            
-            cat_valid, validated_cat = self.validate_category(category)
-            if not cat_valid:
-                return {'success': False, 'error': f'Invalid category: {category}'}
-            
-            currency_valid, validated_currency = self.validate_currency(currency)
-            if not currency_valid:
-                return {'success': False, 'error': f'Invalid currency: {currency}'}
-            
-            budget = BudgetDB(
-                department=validated_dept,
-                category=validated_cat,
-                period_start=start_date,
-                period_end=end_date,
-                allocated_amount=allocated_amount,
-                currency=validated_currency,
-                spent_amount=0.0,
-                created_at=datetime.utcnow()
-            )
+            budget, error = self._build_budget(department, category, period_start,
+                                               period_end, allocated_amount, currency)
+            if error:
+                return {'success': False, 'error': error}
             
             self.db.add(budget)
             self.db.commit()
             
             return {'success': True, 'id': budget.id}
             
+        except IntegrityError:
+            self.db.rollback()
+            return {'success': False, 'duplicate': True, 'error': 'Budget already exists'}
         except Exception as e:
             self.db.rollback()
             return {'success': False, 'error': str(e)}
     
-    def get_spending_by_department(self, months: int = 12) -> List[Dict]:
-        """Get spending breakdown by department."""
+    @staticmethod
+    def budget_key(department: str, category: str, period_start: str,
+                   period_end: str, currency: str, allocated_amount: float) -> str:
+        """Build the canonical 'dept|cat|start|end|currency|cents' key matching uq_budget_currency."""
+        cents = int(round(float(allocated_amount) * 100))
+        return f"{department}|{category}|{period_start}|{period_end}|{currency}|{cents}"
+    
+    def _stored_budget_keys(self, period_starts: set) -> set:
+        """Return canonical keys of stored budgets starting on any of the given dates."""
+        if not period_starts:
+            return set()
+        
+        rows = self.db.query(BudgetDB).with_entities(
+            BudgetDB.department,
+            BudgetDB.category,
+            BudgetDB.period_start,
+            BudgetDB.period_end,
+            BudgetDB.currency,
+            BudgetDB.allocated_amount
+        ).filter(BudgetDB.period_start.in_(period_starts)).all()
+        
+        return {
+            self.budget_key(row.department, row.category,
+                            row.period_start.strftime('%Y-%m-%d'),
+                            row.period_end.strftime('%Y-%m-%d'),
+                            row.currency, row.allocated_amount)
+            for row in rows
+        }
+    
+    def delete_budget(self, budget_id: int) -> Dict:
+        """Delete a budget record by id."""
+        try:
+            deleted = self.db.query(BudgetDB).filter(BudgetDB.id == budget_id).delete()
+            self.db.commit()
+            
+            if not deleted:
+                return {'success': False, 'error': f'Budget not found: {budget_id}'}
+            return {'success': True, 'id': budget_id}
+            
+        except Exception as e:
+            self.db.rollback()
+            return {'success': False, 'error': str(e)}
+    
+    def _add_bulk(self, rows: List[Tuple[Optional[object], Optional[str]]]) -> List[Dict]:
+        """Insert pre-validated rows in one transaction and report per-row status."""
+        results = []
+        valid_rows = []
+        for row, error in rows:
+            if error:
+                results.append({'success': False, 'error': error})
+            else:
+                results.append({'success': True})
+                valid_rows.append(row)
+        
+        try:
+            ids = []
+            if valid_rows:
+                self.db.add_all(valid_rows)
+                # Read generated ids before commit expires the rows and each read becomes a SELECT
+                self.db.flush()
+                ids = [row.id for row in valid_rows]
+                self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            return [{'success': False, 'error': str(e)} for _ in rows]
+        
+        # Assign generated ids back to the successful rows, in order
+        ids = iter(ids)
+        for result in results:
+            if result['success']:
+                result['id'] = next(ids)
+        return results
+    
+    def add_expenses_bulk(self, expenses: List[Dict]) -> List[Dict]:
+        """Add multiple expense records in a single transaction."""
+        return self._add_bulk([self._build_expense(**expense) for expense in expenses])
+    
+    def _duplicate_budget_positions(self, budgets: List[BudgetDB]) -> set:
+        """Return positions of budgets that are already stored or repeat an earlier one in the list."""
+        seen_keys = self._stored_budget_keys({budget.period_start for budget in budgets})
+        duplicates = set()
+        for position, budget in enumerate(budgets):
+            key = self.budget_key(budget.department, budget.category,
+                                  budget.period_start.strftime('%Y-%m-%d'),
+                                  budget.period_end.strftime('%Y-%m-%d'),
+                                  budget.currency, budget.allocated_amount)
+            if key in seen_keys:
+                duplicates.add(position)
+            seen_keys.add(key)
+        return duplicates
+    
+    def add_budgets_bulk(self, budgets: List[Dict]) -> List[Dict]:
+        """Add multiple budget records in a single transaction, skipping duplicates."""
+        rows = [self._build_budget(**budget) for budget in budgets]
+        
+        # Reject rows that are already stored or repeated within this batch
+        valid = [(index, row) for index, (row, error) in enumerate(rows) if not error]
+        duplicates = {valid[position][0] for position in self._duplicate_budget_positions([row for _, row in valid])}
+        for index in duplicates:
+            rows[index] = (None, 'Budget already exists')
+        
+        results = self._add_bulk(rows)
+        for index in duplicates:
+            results[index]['duplicate'] = True
+        return results
+    
+    def get_spending_by_department(self, months: int = 12, top_n: Optional[int] = None) -> List[Dict]:
+        """Get spending breakdown by department, optionally only the top_n largest."""
         try:
             from sqlalchemy import func
             from datetime import datetime, timedelta
@@ -739,7 +929,7 @@ class DataProcessor:
                 ExpenseDB.department
             ).order_by(
                 func.sum(ExpenseDB.amount).desc()
-            ).all()
+            ).limit(top_n).all()
             
             return [
                 {
@@ -754,8 +944,8 @@ class DataProcessor:
         except Exception as e:
             return []
     
-    def get_spending_by_category(self, months: int = 12) -> List[Dict]:
-        """Get spending breakdown by category."""
+    def get_spending_by_category(self, months: int = 12, top_n: Optional[int] = None) -> List[Dict]:
+        """Get spending breakdown by category, optionally only the top_n largest."""
         try:
             from sqlalchemy import func
             from datetime import datetime, timedelta
@@ -773,7 +963,7 @@ class DataProcessor:
                 ExpenseDB.category
             ).order_by(
                 func.sum(ExpenseDB.amount).desc()
-            ).all()
+            ).limit(top_n).all()
             
             return [
                 {
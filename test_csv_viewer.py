@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test script for the CSV viewer aggregation engines."""
+
+import tempfile
+from pathlib import Path
+
+import csv_viewer
+from csv_viewer import CSVViewer, PANDAS_AVAILABLE, PYARROW_AVAILABLE
+
+# One good row per category plus a short row, a long row, an unparseable amount
+# and a complete row whose trailing category is empty
+MALFORMED_CSV = """id,date,amount,vendor,description,department,category
+1,2024-01-05,100.50,AWS,Hosting,Engineering,IT Infrastructure
+2,2024-01-06,20,Staples,Paper,Operations
+3,2024-02-01,30.25,Delta,Trip,Sales,Travel,extra
+4,2024-02-03,abc,Delta,Trip,Sales,Travel
+5,2024-02-04,40,Uber,Ride,Sales,Travel
+6,2024-02-05,7.25,Staples,Pens,Operations,
+"""
+
+def _engines(viewer):
+    """Return the aggregation engines usable in this environment."""
+    engines = {'csv': viewer._aggregate_with_csv}
+    if PANDAS_AVAILABLE:
+        engines['pandas'] = viewer._aggregate_with_pandas
+    if PYARROW_AVAILABLE:
+        engines['pyarrow'] = viewer._aggregate_with_pyarrow
+    return engines
+
+def _normalize(summary):
+    """Round totals so engines that sum in a different order compare equal."""
+    total_records, total_amount, *breakdowns = summary
+    return (total_records, round(total_amount, 2), [
+        {key: (data['count'], round(data['total'], 2)) for key, data in breakdown.items()}
+        for breakdown in breakdowns
+    ])
+
+def test_engines_skip_malformed_rows():
+    """All engines should skip the same malformed rows and report the same totals."""
+    print("\n🧪 Testing aggregation engines on a file with malformed rows...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / "expenses.csv"
+        file_path.write_text(MALFORMED_CSV, encoding='utf-8')
+        
+        results = {name: _normalize(engine(file_path)) for name, engine in _engines(CSVViewer()).items()}
+    
+    for name, (total_records, total_amount, _) in results.items():
+        print(f"  • {name:8} {total_records} records, ${total_amount:,.2f}")
+    
+    expected = results['csv']
+    assert expected[0] == 3 and expected[1] == 147.75, f"csv engine totals: {expected[:2]}"
+    assert expected[2][1] == {'IT Infrastructure': (1, 100.5), 'Travel': (1, 40.0), '': (1, 7.25)}
+    for name, result in results.items():
+        assert result == expected, f"{name} engine differs from csv engine: {result}"
+    
+    print("✅ All engines agree")
+
+def test_parallel_csv_matches_single_pass():
+    """Byte-range worker processes should add up to the single-process csv totals."""
+    print("\n🧪 Testing the multiprocessing csv path against the single-process pass...")
+    
+    header, *rows = MALFORMED_CSV.splitlines()
+    viewer = CSVViewer()
+    original_min_bytes = csv_viewer.PARALLEL_MIN_BYTES
+    csv_viewer.PARALLEL_MIN_BYTES = 0  # Split even this small file across workers
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = Path(tmp) / "expenses.csv"
+            file_path.write_text("\n".join([header] + rows * 250) + "\n", encoding='utf-8')
+            
+            expected = _normalize(viewer._aggregate_with_csv(file_path))
+            for workers in (2, 3):
+                result = _normalize(viewer._aggregate_with_csv_parallel(file_path, workers))
+                assert result == expected, f"{workers} workers differ from single pass: {result[:2]}"
+    finally:
+        csv_viewer.PARALLEL_MIN_BYTES = original_min_bytes
+    
+    assert expected[:2] == (750, 36937.5), f"single-pass totals: {expected[:2]}"
+    print(f"✅ Parallel totals match: {expected[0]} records, ${expected[1]:,.2f}")
+
+def main():
+    """Run all CSV viewer tests."""
+    print("🧪 Testing Nsight AI CSV Viewer")
+    print("=" * 50)
+    
+    try:
+        test_engines_skip_malformed_rows()
+        test_parallel_csv_matches_single_pass()
+        print("\n🎉 CSV viewer tests PASSED!")
+    except AssertionError as e:
+        print(f"❌ CSV viewer test failed: {e}")
+
+if __name__ == "__main__":
+    main()